@@ -0,0 +1,820 @@
+"""Benchmarks for the OLX car cover scraper.
+
+Usage:
+    python benchmarks.py startup [--runs N]
+    python benchmarks.py classifier [--repeat N]
+    python benchmarks.py memory [--count N]
+    python benchmarks.py html [--runs N] [FILE ...]
+    python benchmarks.py dedup [--count N] [--threshold T]
+    python benchmarks.py enhance [--sizes N ...] [--top N]
+    python benchmarks.py e2e [--paths api paginated html] [--items N] [--runs N] [--baseline FILE]
+    python benchmarks.py parse [--size N] [--facet-limits N ...] [--runs N]
+"""
+import argparse
+import glob
+import importlib.util
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULE_PATH = os.path.join(PROJECT_DIR, 'car-cover.py')
+RESULTS_DIR = os.path.join(PROJECT_DIR, 'olx_scraping_results')
+DEBUG_PAGE = os.path.join(PROJECT_DIR, 'debug_page_source.html')
+
+# Modules car-cover.py used to import unconditionally at load time
+EAGER_IMPORTS = [
+    'undetected_chromedriver',
+    'selenium.webdriver',
+    'selenium.webdriver.common.by',
+    'selenium.webdriver.support.ui',
+    'selenium.webdriver.support.expected_conditions',
+    'selenium.webdriver.common.action_chains',
+    'selenium.webdriver.common.keys',
+    'selenium.common.exceptions',
+    'selenium.webdriver.chrome.service',
+    'webdriver_manager.chrome',
+    'fake_useragent',
+    'pandas',
+    'bs4',
+]
+
+# Child process: optionally pre-import the eager set, load car-cover.py, create a
+# scraper, then report elapsed time and peak RSS.
+STARTUP_PROBE = r'''
+import importlib, importlib.util, json, resource, sys, time
+start = time.perf_counter()
+for name in json.loads(sys.argv[2]):
+    importlib.import_module(name)
+spec = importlib.util.spec_from_file_location("car_cover_module", sys.argv[1])
+mod = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = mod
+spec.loader.exec_module(mod)
+mod.ImprovedOLXScraper(headless=True)
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"import_seconds": elapsed, "peak_rss_kb": rss_kb, "modules": len(sys.modules)}))
+'''
+
+
+def load_scraper_module():
+    """Load car-cover.py as a module (the file name is not importable directly)"""
+    spec = importlib.util.spec_from_file_location("car_cover_module", MODULE_PATH)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)  # type: ignore
+    return mod
+
+
+def load_saved_listings():
+    """All listings from the JSON result files checked into olx_scraping_results/"""
+    listings = []
+    for path in sorted(glob.glob(os.path.join(RESULTS_DIR, '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            listings.extend(data.get('listings') or [])
+    return listings
+
+
+def saved_listing_to_api_item(listing, ad_id=None):
+    """Rebuild a relevance-API style item from a saved (normalized) listing"""
+    return {
+        'id': ad_id if ad_id is not None else listing.get('id'),
+        'title': listing.get('title') or '',
+        'description': listing.get('description') or '',
+        'price': {'value': {'raw': listing.get('price_numeric'), 'display': listing.get('price') or ''}},
+        'locations_resolved': {
+            'ADMIN_LEVEL_3_name': listing.get('location') or '',
+            'CITY_name': listing.get('city') or '',
+        },
+        'images': [{'url': listing.get('image_url')}] if listing.get('image_url') else [],
+        'is_featured': bool(listing.get('featured')),
+        'created_time': listing.get('posted_at_ts'),
+    }
+
+
+def synthetic_api_items(count):
+    """count API items cycled from the saved results, each with a unique id and title"""
+    saved = load_saved_listings()
+    items = []
+    for i in range(count):
+        base = saved[i % len(saved)]
+        item = saved_listing_to_api_item(base, ad_id=str(10**9 + i))
+        item['title'] = f"{item['title']} #{i}"
+        items.append(item)
+    return items
+
+
+def synthetic_facets(limit, facets=8):
+    """Facet sections shaped like the relevance API's, `limit` values each (the scraper never reads them)"""
+    return [{
+        'id': f'facet_{f}',
+        'values': [{'id': str(i), 'key': f'value-{i}', 'label': f'Value {i}', 'count': 5000 - i,
+                    'url': f'/items/q-car-cover?filter=facet_{f}_eq_{i}'} for i in range(limit)],
+    } for f in range(facets)]
+
+
+def relevance_body(items, metadata, facet_limit, facets_first=False):
+    """Encoded relevance API response; facets go after data/metadata unless facets_first"""
+    facets = synthetic_facets(facet_limit)
+    if facets_first:
+        data = {'facets': facets, 'data': items, 'metadata': metadata}
+    else:
+        data = {'data': items, 'metadata': metadata, 'facets': facets}
+    return json.dumps(data).encode('utf-8')
+
+
+def legacy_filter_to_car_cover(listing):
+    """The pre-classifier filter_to_car_cover, kept verbatim as the reference implementation"""
+    text = ' '.join([
+        str(listing.get('title') or ''),
+        str(listing.get('description') or ''),
+        str(listing.get('category') or '')
+    ]).lower()
+    include_patterns = [
+        r'\bcar\s*cover\b',
+        r'\bbody\s*cover\b',
+        r'\bcar\s*body\s*cover\b',
+        r'\bwaterproof\s*car\s*cover\b',
+        r'\bcar\s*sheet\s*cover\b',
+    ]
+    if not any(re.search(p, text, flags=re.I) for p in include_patterns):
+        return False
+    exclude_patterns = [
+        r'\bbhk\b', r'\bsq\.?ft\b', r'\bapartment\b', r'\bflat\b', r'\bhouse\b',
+        r'\boffice\b', r'\brent\b', r'\bsale\b', r'\bparking\b', r'\bcovered\b',
+        r'\bgaj\b', r'\bshop\b', r'\bcommercial\b', r'\bworkspace\b', r'\bplot\b',
+    ]
+    if any(re.search(p, text, flags=re.I) for p in exclude_patterns):
+        return False
+    return True
+
+
+def legacy_remove_duplicates(listings):
+    """The pre-DedupIndex remove_duplicates (exact lowercased title), kept as the reference"""
+    unique_listings = []
+    seen_titles = set()
+    for listing in listings:
+        title = listing.get('title', '').lower().strip()
+        if title and title not in seen_titles:
+            seen_titles.add(title)
+            unique_listings.append(listing)
+        elif not title and listing.get('price'):
+            unique_listings.append(listing)
+    return unique_listings
+
+
+def synthetic_duplicate_listings(mod, count, seed=7):
+    """count listings: ~60% distinct ads, the rest same-id, same-URL, repost and near-repost copies"""
+    rng = random.Random(seed)
+    vocab = sorted({
+        word for l in load_saved_listings()
+        for word in re.findall(r'[a-z]+', f"{l.get('title') or ''} {l.get('description') or ''}".lower())
+        if len(word) > 2
+    })
+    listings, kinds, originals = [], {}, []
+    for i in range(count):
+        ad_id = str(10**9 + i)
+        roll = rng.random()
+        if not originals or roll < 0.6:
+            kind = 'original'
+            words = rng.sample(vocab, 8)
+            price = rng.randrange(300, 5000)
+            listing = mod.Listing(
+                id=ad_id, title=' '.join(words).capitalize(), description=' '.join(rng.sample(vocab, 20)),
+                price=f"₹ {price:,}", price_numeric=price, city=rng.choice(['Delhi', 'Mumbai', 'Pune']),
+                url=f"https://www.olx.in/item/{'-'.join(words[:3])}-iid-{ad_id}",
+            )
+            originals.append(listing)
+        else:
+            listing = mod.Listing.from_dict(rng.choice(originals).to_dict())
+            if roll < 0.7:
+                kind = 'same_id'  # the same ad seen again through another city/query
+                listing['city'] = 'Bangalore'
+            elif roll < 0.8:
+                kind = 'same_url'
+                listing['id'] = ad_id
+                listing['url'] = listing['url'] + '/?from=search'
+            elif roll < 0.9:
+                kind = 'repost'  # new ad, same title and price (a distinct ad for exact dedup)
+                listing['id'] = ad_id
+                listing['url'] = f"https://www.olx.in/item/repost-iid-{ad_id}"
+            else:
+                kind = 'near_repost'  # new ad, one title word swapped and a new price
+                words = listing['title'].lower().split()
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+                listing['id'] = ad_id
+                listing['title'] = ' '.join(words).capitalize()
+                listing['price_numeric'] += rng.randrange(-100, 100)
+                listing['price'] = f"₹ {listing['price_numeric']:,}"
+                listing['url'] = f"https://www.olx.in/item/repost-iid-{ad_id}"
+        kinds[kind] = kinds.get(kind, 0) + 1
+        listings.append(listing)
+    return listings, kinds
+
+
+def legacy_enhance_listings(listings, sort_by='quality', featured_first=False):
+    """The pre-vectorization enhance_listings/enhance_listing pair, kept as the reference"""
+    enhanced = []
+    for listing in listings:
+        if listing.get('title'):
+            listing['title'] = re.sub(r'\s+', ' ', listing['title'].strip())
+        if listing.get('price'):
+            price_match = re.search(r'[\d,]+', listing['price'].replace(' ', ''))
+            if price_match:
+                numeric_price = price_match.group().replace(',', '')
+                if numeric_price.isdigit():
+                    listing['price_numeric'] = int(numeric_price)
+                    listing['price_formatted'] = f"₹{int(numeric_price):,}"
+        quality_score = 0
+        if listing.get('title'): quality_score += 3
+        if listing.get('price'): quality_score += 3
+        if listing.get('location'): quality_score += 2
+        if listing.get('url'): quality_score += 1
+        if listing.get('image_url'): quality_score += 1
+        listing['quality_score'] = quality_score
+        enhanced.append(listing)
+
+    def sort_key(x):
+        key_parts = []
+        if featured_first:
+            key_parts.append(0 if x.get('featured') else 1)
+        if sort_by == 'date':
+            key_parts.append(-int(x.get('posted_at_ts') or 0))
+        elif sort_by == 'price':
+            key_parts.append(-(x.get('price_numeric') or 0))
+        else:
+            key_parts.append(-(x.get('quality_score', 0)))
+        return tuple(key_parts)
+
+    enhanced.sort(key=sort_key)
+    return enhanced
+
+
+def synthetic_listing_rows(count, seed=11):
+    """Field values for count listings with missing fields, duplicate prices/dates and messy titles"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        price = rng.choice([None, rng.randrange(100, 20000)])
+        rows.append({
+            'id': str(10**9 + i),
+            'title': rng.choice(['', f"  Car  body cover\tmodel {i % 500}  "]),
+            'price': f"₹ {price:,}" if price else '',
+            'price_numeric': price,
+            'location': rng.choice(['', 'Delhi', 'Mumbai']),
+            'url': rng.choice(['', f"https://www.olx.in/item/cover-iid-{10**9 + i}"]),
+            'image_url': rng.choice(['', 'https://img.olx.in/x.jpg']),
+            'featured': rng.random() < 0.1,
+            'posted_at_ts': 1756000000 + rng.randrange(0, 86400 * 30, 3600),
+        })
+    return rows
+
+
+class MockOLXHandler(BaseHTTPRequestHandler):
+    """Replays recorded fixtures: relevance API pages and the saved results page for anything else"""
+
+    server_version = "MockOLX/1.0"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out as separate writes on keep-alive connections
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path == '/api/relevance/v4/search':
+            query = parse_qs(parsed.query)
+            body = self.server.api_page(int(query.get('page', ['0'])[0]), int(query.get('size', ['40'])[0]),
+                                        int(query.get('facet_limit', ['0'])[0]))
+            content_type = 'application/json'
+        else:
+            body = self.server.html
+            content_type = 'text/html; charset=utf-8'
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockOLXServer(ThreadingHTTPServer):
+    """Local stand-in for www.olx.in serving synthetic_api_items() pages and debug_page_source.html"""
+
+    daemon_threads = True
+
+    def __init__(self, items, html, latency=0.0, address=('127.0.0.1', 0)):
+        super().__init__(address, MockOLXHandler)
+        self.items = items
+        self.html = html
+        self.latency = latency
+        self._pages = {}
+
+    def api_page(self, page, size, facet_limit=0):
+        """Encoded response body for one page (built once, so serving cost stays out of the numbers)"""
+        key = (page, size, facet_limit)
+        if key not in self._pages:
+            chunk = self.items[page * size:(page + 1) * size]
+            more = (page + 1) * size < len(self.items)
+            next_url = f"/api/relevance/v4/search?page={page + 1}&size={size}" if more else ''
+            self._pages[key] = relevance_body(chunk, {'next_page_url': next_url}, facet_limit)
+        return self._pages[key]
+
+
+def serve_mock_olx(conn, item_count, html_path, latency):
+    """Child process: run a MockOLXServer and send its URL back over conn"""
+    with open(html_path, 'rb') as f:
+        html = f.read()
+    server = MockOLXServer(synthetic_api_items(item_count), html, latency)
+    conn.send(f"http://127.0.0.1:{server.server_address[1]}")
+    server.serve_forever()
+
+
+@contextlib.contextmanager
+def mock_olx_server(item_count, html_path=DEBUG_PAGE, latency=0.0):
+    """Run the mock server in its own process (it must not compete with the scraper for the GIL)"""
+    parent, child = multiprocessing.Pipe()
+    proc = multiprocessing.Process(target=serve_mock_olx, args=(child, item_count, html_path, latency), daemon=True)
+    proc.start()
+    try:
+        if not parent.poll(30):
+            raise SystemExit("Mock OLX server did not start")
+        yield parent.recv()
+    finally:
+        proc.terminate()
+        proc.join()
+
+
+def git_revision():
+    """Short commit hash of the working tree, or None outside a git checkout"""
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=PROJECT_DIR)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def timed(fn, *args):
+    """Return (result, seconds) for one call"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run_startup_probe(preload):
+    """Run one fresh interpreter and return the probe's measurements"""
+    out = subprocess.run(
+        [sys.executable, '-c', STARTUP_PROBE, MODULE_PATH, json.dumps(preload)],
+        capture_output=True, text=True, check=True, cwd=PROJECT_DIR,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def bench_startup(args):
+    """Compare lazy-import startup against the old eager import set"""
+    results = {}
+    for label, preload in (('lazy', []), ('eager', EAGER_IMPORTS)):
+        samples = [run_startup_probe(preload) for _ in range(args.runs)]
+        results[label] = {
+            'import_seconds_median': statistics.median(s['import_seconds'] for s in samples),
+            'peak_rss_kb_median': statistics.median(s['peak_rss_kb'] for s in samples),
+            'modules_loaded': samples[-1]['modules'],
+            'runs': args.runs,
+        }
+
+    lazy, eager = results['lazy'], results['eager']
+    print(f"{'mode':<8}{'import (s)':>12}{'peak RSS (MB)':>16}{'modules':>10}")
+    for label in ('eager', 'lazy'):
+        r = results[label]
+        print(f"{label:<8}{r['import_seconds_median']:>12.3f}{r['peak_rss_kb_median'] / 1024:>16.1f}{r['modules_loaded']:>10}")
+    print(f"Import time saved: {eager['import_seconds_median'] - lazy['import_seconds_median']:.3f}s, "
+          f"RSS saved: {(eager['peak_rss_kb_median'] - lazy['peak_rss_kb_median']) / 1024:.1f} MB")
+    return results
+
+
+def bench_classifier(args):
+    """Legacy per-call regex filter vs the precompiled CarCoverClassifier on saved listings"""
+    mod = load_scraper_module()
+    classifier = mod.CarCoverClassifier()
+    listings = load_saved_listings() * args.repeat
+    if not listings:
+        print(f"No saved listings found in {RESULTS_DIR}")
+        return {}
+
+    legacy, legacy_s = timed(lambda items: [legacy_filter_to_car_cover(l) for l in items], listings)
+    single, single_s = timed(lambda items: [classifier.matches(l) for l in items], listings)
+    batch, batch_s = timed(classifier.classify, listings)
+
+    mismatches = sum(1 for a, b, c in zip(legacy, single, batch) if not (a == b == c))
+    results = {
+        'listings': len(listings),
+        'accepted': sum(legacy),
+        'mismatches': mismatches,
+        'legacy_seconds': legacy_s,
+        'matches_seconds': single_s,
+        'classify_seconds': batch_s,
+    }
+    print(f"{len(listings)} listings ({sum(legacy)} accepted), decision mismatches: {mismatches}")
+    for label, secs in (('legacy filter', legacy_s), ('classifier.matches', single_s), ('classifier.classify', batch_s)):
+        print(f"{label:<22}{secs * 1000:>10.1f} ms{len(listings) / secs:>14,.0f} listings/s")
+    print(f"Speed-up (classify vs legacy): {legacy_s / batch_s:.1f}x")
+    if mismatches:
+        raise SystemExit("Classifier decisions differ from the legacy filter")
+    return results
+
+
+def retained_bytes(build):
+    """Bytes still allocated after build() returns (its result is kept alive while measuring)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return kept, after - before
+
+
+def bench_memory(args):
+    """Bytes per listing: __slots__ Listing records vs the plain dicts they replaced"""
+    mod = load_scraper_module()
+    scraper = mod.ImprovedOLXScraper(headless=True)
+    scraper.no_filter = True
+    items = synthetic_api_items(args.count)
+
+    records, record_bytes = retained_bytes(lambda: [scraper.normalize_api_listing(it) for it in items])
+    del records
+    dicts, dict_bytes = retained_bytes(lambda: [scraper.normalize_api_listing(it).to_dict() for it in items])
+    sample = dicts[0]
+    del dicts
+
+    container_record = sys.getsizeof(mod.Listing.from_dict(sample))
+    container_dict = sys.getsizeof(sample)
+    results = {
+        'listings': args.count,
+        'listing_bytes_per_record': record_bytes / args.count,
+        'dict_bytes_per_record': dict_bytes / args.count,
+        'listing_container_bytes': container_record,
+        'dict_container_bytes': container_dict,
+    }
+    print(f"{args.count} normalized listings (values included)")
+    print(f"{'dict':<10}{dict_bytes / args.count:>10.0f} bytes/listing   container {container_dict} bytes")
+    print(f"{'Listing':<10}{record_bytes / args.count:>10.0f} bytes/listing   container {container_record} bytes")
+    print(f"Saved: {(dict_bytes - record_bytes) / args.count:.0f} bytes/listing "
+          f"({(1 - record_bytes / dict_bytes) * 100:.0f}%)")
+    return results
+
+
+def bench_html(args):
+    """Parse + extract time per HTML backend on saved result pages; checks backends agree"""
+    mod = load_scraper_module()
+    pages = args.files or [DEBUG_PAGE]
+    backends = mod.HTMLExtractionEngine.available_backends()
+    results = {}
+    for path in pages:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            html = f.read()
+        page_results = {}
+        reference = None
+        print(f"{os.path.basename(path)} ({len(html) / 1024:.0f} KB)")
+        for name in backends:
+            engine = mod.HTMLExtractionEngine(name)
+            timings = []
+            for _ in range(args.runs):
+                cards, secs = timed(engine.extract, html)
+                timings.append(secs)
+            reference = cards if reference is None else reference
+            page_results[name] = {
+                'cards': len(cards),
+                'median_seconds': statistics.median(timings),
+                'matches_first_backend': cards == reference,
+            }
+            print(f"  {name:<12}{statistics.median(timings) * 1000:>9.1f} ms{len(cards):>6} cards"
+                  f"{'' if cards == reference else '   (differs from ' + backends[0] + ')'}")
+        results[os.path.basename(path)] = page_results
+    return results
+
+
+def bench_dedup(args):
+    """Dedup throughput and accuracy on synthetic reposts: legacy title set vs DedupIndex (exact, near)"""
+    mod = load_scraper_module()
+    listings, kinds = synthetic_duplicate_listings(mod, args.count)
+    print(f"{args.count} listings: " + ', '.join(f"{k}={v}" for k, v in sorted(kinds.items())))
+    exact_dups = kinds.get('same_id', 0) + kinds.get('same_url', 0)
+    reposts = kinds.get('repost', 0) + kinds.get('near_repost', 0)
+
+    def dedup(near):
+        index = mod.DedupIndex(near_duplicates=near, threshold=args.threshold)
+        return [l for l in listings if index.add(l)]
+
+    # (name, run, listings it should keep): exact dedup keeps reposts, which have their own ad ids
+    methods = [
+        ('legacy', lambda: legacy_remove_duplicates(listings), kinds['original']),
+        ('exact', lambda: dedup(False), kinds['original'] + reposts),
+        ('near', lambda: dedup(True), kinds['original']),
+    ]
+    results = {'listings': args.count, 'kinds': kinds}
+    print(f"{'method':<8}{'seconds':>9}{'listings/s':>12}{'kept':>9}{'missed dups':>13}")
+    for name, run, expected in methods:
+        kept, secs = timed(run)
+        missed = len(kept) - expected
+        results[name] = {
+            'seconds': secs,
+            'listings_per_second': args.count / secs,
+            'kept': len(kept),
+            'missed_duplicates': missed,
+        }
+        print(f"{name:<8}{secs:>9.2f}{args.count / secs:>12.0f}{len(kept):>9}{missed:>13}")
+    print(f"exact duplicates injected: {exact_dups}, reposts injected: {kinds.get('repost', 0)} exact, "
+          f"{kinds.get('near_repost', 0)} near")
+
+    # Near-duplicate mode must stay sub-quadratic: cost per listing at 1/10 size vs full size
+    small, _ = synthetic_duplicate_listings(mod, max(1, args.count // 10))
+    index = mod.DedupIndex(near_duplicates=True, threshold=args.threshold)
+    _, small_secs = timed(lambda: [l for l in small if index.add(l)])
+    per_small = small_secs / len(small) * 1e6
+    per_full = results['near']['seconds'] / args.count * 1e6
+    results['near_us_per_listing'] = {str(len(small)): per_small, str(args.count): per_full}
+    print(f"near mode: {per_small:.1f} us/listing at {len(small)}, {per_full:.1f} us/listing at {args.count}")
+    return results
+
+
+def title_cleanup_mismatches(mod, rows):
+    """Titles where clean_listing's split/join differs from the legacy re.sub cleanup"""
+    # Benchmark rows, every saved title and whitespace edge cases (Unicode spaces, separators)
+    titles = [r['title'] for r in rows] + [l.get('title') or '' for l in load_saved_listings()]
+    titles += ['\u00a0Car\u2003cover\u00a0', 'a\r\nb\x0b\x0cc', '\x1cCar\x1dbody\x1ecover\x1f',
+               'cover\u2028new\u2029line\u3000x', '\t\n ', 'x\u200by', 'x\u0085y\u180ez']
+    scraper = mod.ImprovedOLXScraper(headless=True)
+    return [t for t in titles
+            if scraper.clean_listing({'title': t})['title'] != (re.sub(r'\s+', ' ', t.strip()) if t else t)]
+
+
+def bench_enhance(args):
+    """Batch enhance + sort vs the old per-record loop, per size and sort mode; checks identical order"""
+    mod = load_scraper_module()
+    scraper = mod.ImprovedOLXScraper(headless=True)
+    modes = [('quality', False), ('date', False), ('price', False), ('quality', True)]
+    # Warm up with enough rows to take the numpy path, so its import is not timed
+    scraper.enhance_listings([mod.Listing(**r) for r in synthetic_listing_rows(scraper.NUMPY_MIN_LISTINGS)])
+    results = {}
+    print(f"{'listings':>9} {'sort':<16}{'legacy s':>10}{'batch s':>10}{'top s':>10}{'speedup':>9}  same order")
+    for size in args.sizes:
+        rows = synthetic_listing_rows(size)
+        size_results = {}
+        for sort_by, featured_first in modes:
+            label = sort_by + ('+featured' if featured_first else '')
+            scraper.sort_by, scraper.featured_first, scraper.top_n = sort_by, featured_first, None
+            legacy, legacy_secs = timed(legacy_enhance_listings, [mod.Listing(**r) for r in rows], sort_by, featured_first)
+            batch, batch_secs = timed(scraper.enhance_listings, [mod.Listing(**r) for r in rows])
+            top, top_secs = timed(scraper.enhance_listings, [mod.Listing(**r) for r in rows], args.top)
+            legacy_ids = [l['id'] for l in legacy]
+            same = legacy_ids == [l['id'] for l in batch] and legacy_ids[:args.top] == [l['id'] for l in top]
+            size_results[label] = {
+                'legacy_seconds': legacy_secs,
+                'batch_seconds': batch_secs,
+                'top_seconds': top_secs,
+                'same_order': same,
+            }
+            print(f"{size:>9} {label:<16}{legacy_secs:>10.3f}{batch_secs:>10.3f}{top_secs:>10.3f}"
+                  f"{legacy_secs / batch_secs:>8.1f}x  {'yes' if same else 'NO'}")
+        results[str(size)] = size_results
+    mismatches = title_cleanup_mismatches(mod, synthetic_listing_rows(max(args.sizes)))
+    results['title_cleanup_mismatches'] = mismatches
+    print(f"title cleanup same as re.sub: {'yes' if not mismatches else f'NO ({len(mismatches)} titles)'}")
+    return results
+
+
+def e2e_pipeline(scraper, path):
+    """One end-to-end run of a scraper path against the mock server; returns listings saved"""
+    if path == 'html':
+        # Requests fallback: fetch the results page, extract, save (what finish_browser_listings does)
+        url = scraper.search_urls[0]
+        listings = scraper.parse_html_content(scraper.try_requests_fallback(url) or '', url)
+    else:
+        if path == 'api':
+            listings = scraper.fetch_via_relevance_api(query=scraper.api_query, size=scraper.api_size,
+                                                       location=scraper.api_location)
+        else:
+            listings = scraper.fetch_via_relevance_api_paginated(
+                query=scraper.api_query, size=scraper.api_size, location=scraper.api_location,
+                max_pages=scraper.api_max_pages, concurrency=scraper.api_concurrency)
+        listings = scraper.enhance_listings(scraper.remove_duplicates(listings or []))
+    scraper.save_results(listings)
+    return len(listings)
+
+
+def bench_e2e(args):
+    """Listings/sec, per-stage p50/p99 and peak memory per scraper path against a local mock OLX"""
+    mod = load_scraper_module()
+    results = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'items': args.items,
+        'page_size': args.page_size,
+        'latency_ms': args.latency_ms,
+        'no_filter': args.no_filter,
+        'facet_limit': args.facet_limit,
+        'json_parser': args.json_parser,
+        'paths': {},
+    }
+    with mock_olx_server(args.items, args.html, args.latency_ms / 1000) as base_url, \
+            tempfile.TemporaryDirectory() as results_dir:
+        print(f"Mock OLX at {base_url}: {args.items} API items, {os.path.basename(args.html)}")
+        print(f"{'path':<11}{'listings':>9}{'median s':>10}{'listings/s':>12}{'peak MB':>9}")
+        for path in args.paths:
+            scraper = mod.ImprovedOLXScraper(headless=True)
+            scraper.base_url = base_url
+            scraper.search_urls = [base_url + '/items/q-car-cover']
+            scraper.results_dir = results_dir
+            scraper.api_size = args.page_size
+            scraper.api_max_pages = max(1, -(-args.items // args.page_size)) + 1
+            scraper.no_filter = args.no_filter
+            scraper.api_facet_limit = args.facet_limit
+            scraper.json_parser = args.json_parser
+            scraper.profiler = mod.RunProfiler(keep_samples=True)
+            quiet = io.StringIO()
+
+            seconds = []
+            for _ in range(args.runs):
+                with contextlib.redirect_stdout(quiet):
+                    count, secs = timed(e2e_pipeline, scraper, path)
+                seconds.append(secs)
+                quiet.seek(0)
+                quiet.truncate()
+            profile = scraper.profiler.to_dict()
+
+            # Separate run for memory: tracing slows allocation-heavy code, so it is kept out of the timings
+            scraper.profiler = None
+            tracemalloc.start()
+            with contextlib.redirect_stdout(quiet):
+                e2e_pipeline(scraper, path)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            median = statistics.median(seconds)
+            results['paths'][path] = {
+                'listings': count,
+                'runs': args.runs,
+                'median_seconds': median,
+                'listings_per_second': count / median if median else 0.0,
+                'peak_memory_bytes': peak,
+                'stages': {name: {k: span[k] for k in ('calls', 'mean_ms', 'p50_ms', 'p99_ms', 'items_in', 'items_out')}
+                           for name, span in profile['spans'].items()},
+                'counters': profile['counters'],
+            }
+            print(f"{path:<11}{count:>9}{median:>10.3f}{count / median if median else 0:>12,.0f}{peak / 2**20:>9.1f}")
+            for name, span in profile['spans'].items():
+                print(f"    {name:<34}{span['calls']:>8} calls  p50 {span['p50_ms']:>9.3f} ms  p99 {span['p99_ms']:>9.3f} ms")
+
+    if args.baseline:
+        compare_e2e(results, args.baseline, args.tolerance)
+    return results
+
+
+def compare_e2e(results, baseline_path, tolerance):
+    """Print listings/sec and peak memory changes against an earlier `--json` e2e result"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f).get('results', {})
+    print(f"\nvs {baseline_path} (revision {baseline.get('revision') or 'unknown'})")
+    regressions = []
+    for path, current in results['paths'].items():
+        before = baseline.get('paths', {}).get(path)
+        if not before:
+            print(f"  {path:<11}no baseline")
+            continue
+        speed = current['listings_per_second'] / before['listings_per_second'] - 1 if before['listings_per_second'] else 0.0
+        memory = current['peak_memory_bytes'] / before['peak_memory_bytes'] - 1 if before['peak_memory_bytes'] else 0.0
+        flag = ''
+        if speed < -tolerance or memory > tolerance:
+            flag = '  REGRESSION'
+            regressions.append(path)
+        print(f"  {path:<11}listings/s {speed * 100:+6.1f}%   peak memory {memory * 100:+6.1f}%{flag}")
+    results['regressions'] = regressions
+
+
+def bench_parse(args):
+    """Per-page parse time and peak memory of each relevance JSON parser, per facet_limit and facet position"""
+    mod = load_scraper_module()
+    items = synthetic_api_items(args.size)
+    metadata = {'next_page_url': '/api/relevance/v4/search?page=1', 'total': 5000}
+    parsers = [('json', None), ('whole', mod.load_relevance_body)]
+    if importlib.util.find_spec('ijson'):
+        parsers.append(('stream', mod.stream_relevance_body))
+    else:
+        print("ijson is not installed: skipping the streaming parser (pip install ijson)")
+
+    def stdlib(body):
+        data = json.loads(body)
+        return data.get('data') or data.get('ads') or [], data.get('metadata') or {}
+
+    results = {}
+    print(f"{'facet_limit':>11} {'facets':<7}{'body KB':>9}  " + ''.join(f"{name + ' ms':>11}{'KB':>8}" for name, _ in parsers))
+    for limit in args.facet_limits:
+        for facets_first in (False, True):
+            body = relevance_body(items, metadata, limit, facets_first)
+            reference = stdlib(body)
+            row = {}
+            for name, parse in parsers:
+                parse = parse or stdlib
+                timings = []
+                for _ in range(args.runs):
+                    parsed, secs = timed(parse, body)
+                    timings.append(secs)
+                _, peak = retained_peak(parse, body)
+                row[name] = {'median_ms': statistics.median(timings) * 1000, 'peak_kb': peak / 1024,
+                             'same_result': parsed == reference}
+            position = 'first' if facets_first else 'last'
+            results[f"{limit}/{position}"] = dict(row, body_kb=len(body) / 1024)
+            print(f"{limit:>11} {position:<7}{len(body) / 1024:>9.0f}  " +
+                  ''.join(f"{row[name]['median_ms']:>11.2f}{row[name]['peak_kb']:>8.0f}" for name, _ in parsers) +
+                  ('' if all(r['same_result'] for r in row.values()) else '   RESULTS DIFFER'))
+    return results
+
+
+def retained_peak(fn, *args):
+    """(result, peak traced bytes) for one call"""
+    tracemalloc.start()
+    result = fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OLX scraper benchmarks")
+    parser.add_argument("--json", type=str, default=None, help="Also write results to this JSON file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("startup", help="Module import time and RSS, lazy vs eager imports")
+    p.add_argument("--runs", type=int, default=5, help="Fresh interpreters per mode (default: 5)")
+    p.set_defaults(func=bench_startup)
+
+    p = sub.add_parser("classifier", help="Car-cover filter throughput on saved results, legacy vs precompiled")
+    p.add_argument("--repeat", type=int, default=200, help="Times to replay the saved listings (default: 200)")
+    p.set_defaults(func=bench_classifier)
+
+    p = sub.add_parser("memory", help="Bytes per listing, __slots__ Listing vs dict")
+    p.add_argument("--count", type=int, default=50000, help="Listings to build (default: 50000)")
+    p.set_defaults(func=bench_memory)
+
+    p = sub.add_parser("html", help="Offline HTML extraction speed per parser backend")
+    p.add_argument("files", nargs="*", help="Saved result pages (default: debug_page_source.html)")
+    p.add_argument("--runs", type=int, default=5, help="Extractions per backend (default: 5)")
+    p.set_defaults(func=bench_html)
+
+    p = sub.add_parser("dedup", help="Dedup throughput and missed duplicates, legacy vs DedupIndex")
+    p.add_argument("--count", type=int, default=100000, help="Synthetic listings (default: 100000)")
+    p.add_argument("--threshold", type=float, default=0.8, help="Near-duplicate similarity threshold (default: 0.8)")
+    p.set_defaults(func=bench_dedup)
+
+    p = sub.add_parser("enhance", help="Batch scoring/sorting vs the per-record loop, with --top partial selection")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="Listing counts (default: 10000 100000)")
+    p.add_argument("--top", type=int, default=50, help="N for the partial-selection run (default: 50)")
+    p.set_defaults(func=bench_enhance)
+
+    p = sub.add_parser("e2e", help="End-to-end listings/s, stage p50/p99 and peak memory against a local mock OLX")
+    p.add_argument("--paths", nargs="+", choices=['api', 'paginated', 'html'], default=['api', 'paginated', 'html'],
+                   help="Scraper paths to run (default: all)")
+    p.add_argument("--items", type=int, default=2000, help="API items served by the mock (default: 2000)")
+    p.add_argument("--page-size", type=int, default=40, help="API page size (default: 40)")
+    p.add_argument("--runs", type=int, default=5, help="Timed runs per path (default: 5)")
+    p.add_argument("--latency-ms", type=float, default=0.0, help="Mock server delay per response (default: 0)")
+    p.add_argument("--no-filter", action="store_true", help="Keep every listing instead of only car covers")
+    p.add_argument("--facet-limit", type=int, default=1000, help="facet_limit requested (the mock returns that many values per facet; default: 1000)")
+    p.add_argument("--json-parser", choices=['auto', 'stream', 'whole', 'json'], default='auto', help="Scraper JSON parser (default: auto)")
+    p.add_argument("--html", type=str, default=DEBUG_PAGE, help="Results page served for HTML requests (default: debug_page_source.html)")
+    p.add_argument("--baseline", type=str, default=None, help="Earlier `--json` e2e output to compare against")
+    p.add_argument("--tolerance", type=float, default=0.10, help="Relative change flagged as a regression (default: 0.10)")
+    p.set_defaults(func=bench_e2e)
+
+    p = sub.add_parser("parse", help="Relevance JSON parse time and peak memory per parser and facet_limit")
+    p.add_argument("--size", type=int, default=120, help="Items per page (default: 120)")
+    p.add_argument("--facet-limits", type=int, nargs="+", default=[1000, 100, 10], help="facet_limit values (default: 1000 100 10)")
+    p.add_argument("--runs", type=int, default=20, help="Parses per body and parser (default: 20)")
+    p.set_defaults(func=bench_parse)
+
+    args = parser.parse_args()
+    results = args.func(args)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'benchmark': args.command, 'results': results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,3 @@
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import requests
 import json
 import csv
@@ -12,23 +5,2114 @@ import time
 import random
 import re
 import os
-from fake_useragent import UserAgent
-import pandas as pd
-from bs4 import BeautifulSoup
+import sys
+import hashlib
+import gzip
+import io
+import sqlite3
+from datetime import datetime, timezone
 from urllib.parse import urljoin, urlparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import threading
+import queue
+import asyncio
 import argparse
+import copy
+import functools
+import heapq
+from contextlib import contextmanager
+from abc import ABC, abstractmethod
+
+# Heavy dependencies (undetected_chromedriver, selenium, webdriver_manager, pandas,
+# BeautifulSoup, fake_useragent) are imported inside the code paths that use them,
+# so API-only runs start without loading a browser stack or DataFrame library.
+
+class RunProfiler:
+    """Per-run spans (calls, seconds, items in/out) and counters, written as a JSON profile.
+
+    Spans aggregate by name, so hot per-record functions stay cheap to instrument; the
+    scraper and its browser workers share one profiler (updates are lock-protected).
+    With keep_samples every call duration is also kept so the profile can report p50/p99.
+    """
+
+    def __init__(self, keep_samples=False):
+        self.started_at = time.time()
+        self.spans = {}
+        self.counters = {}
+        self.samples = {} if keep_samples else None
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, items_in=None, items_out=None):
+        """Add one completed call of a span"""
+        with self._lock:
+            span = self.spans.get(name)
+            if span is None:
+                span = self.spans[name] = {'calls': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+                                           'items_in': 0, 'items_out': 0}
+            span['calls'] += 1
+            span['seconds'] += seconds
+            span['max_seconds'] = max(span['max_seconds'], seconds)
+            if items_in is not None:
+                span['items_in'] += items_in
+            if items_out is not None:
+                span['items_out'] += items_out
+            if self.samples is not None:
+                self.samples.setdefault(name, []).append(seconds)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def percentiles(self, name, points=(50, 99)):
+        """Nearest-rank percentiles of a span's call durations in ms (needs keep_samples)"""
+        samples = sorted((self.samples or {}).get(name) or [])
+        if not samples:
+            return {}
+        result = {}
+        for p in points:
+            rank = max(1, -(-p * len(samples) // 100))  # ceil(p% of n)
+            result[f"p{p}_ms"] = round(samples[rank - 1] * 1000, 3)
+        return result
+
+    def to_dict(self, extra=None):
+        wall = time.time() - self.started_at
+        spans = {}
+        for name, span in sorted(self.spans.items(), key=lambda kv: -kv[1]['seconds']):
+            spans[name] = dict(span, seconds=round(span['seconds'], 6), max_seconds=round(span['max_seconds'], 6),
+                               mean_ms=round(span['seconds'] / span['calls'] * 1000, 3))
+            spans[name].update(self.percentiles(name))
+        profile = {
+            'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            'wall_seconds': round(wall, 3),
+            'spans': spans,
+            'counters': dict(self.counters),
+        }
+        profile.update(extra or {})
+        return profile
+
+    def write(self, path, extra=None):
+        """Write the profile as JSON and return it"""
+        profile = self.to_dict(extra)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2)
+        return profile
+
+
+def profiled(name=None, count_in=None, count_out=None):
+    """Method decorator: record a span on self.profiler (no-op when profiling is off).
+
+    count_in(args) / count_out(result) give the span's items in/out. By default items in
+    = len() of a list first argument (else 1) and items out = len() of a list result,
+    else 1 for a truthy result and 0 otherwise.
+    """
+    def decorate(method):
+        span_name = name or method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = self.profiler
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            if count_in is not None:
+                items_in = count_in(args)
+            else:
+                items_in = len(args[0]) if args and isinstance(args[0], list) else 1
+            items_out = None
+            start = time.perf_counter()
+            try:
+                result = method(self, *args, **kwargs)
+                if count_out is not None:
+                    items_out = count_out(result)
+                else:
+                    items_out = len(result) if isinstance(result, list) else int(bool(result))
+                return result
+            finally:
+                profiler.record(span_name, time.perf_counter() - start, items_in, items_out)
+        return wrapper
+    return decorate
+
+def page_item_count(result):
+    """Items in an (items, metadata) page result (0 for a failed fetch)"""
+    return len(result[0]) if result else 0
+
+class HostRequestBudget:
+    """Thread-safe cap on how many requests a run may send to each host"""
+    def __init__(self, max_requests=None):
+        self.max_requests = max_requests  # None means unlimited
+        self.counts = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url):
+        """Reserve one request for the URL's host; returns False once the budget is spent"""
+        host = urlparse(url).netloc
+        with self._lock:
+            used = self.counts.get(host, 0)
+            if self.max_requests is not None and used >= self.max_requests:
+                return False
+            self.counts[host] = used + 1
+            return True
+
+def accept_encoding():
+    """Accept-Encoding for the codecs urllib3 can decode here (gzip/deflate, plus br and zstd when installed)"""
+    try:
+        from urllib3.util.request import ACCEPT_ENCODING
+        return ', '.join(part.strip() for part in ACCEPT_ENCODING.split(','))
+    except ImportError:
+        return 'gzip, deflate'
+
+class HTTPTransport:
+    """Shared HTTP client: a sized keep-alive connection pool, session-level headers and reuse stats.
+
+    Backed by a requests.Session with an HTTPAdapter by default, or by an httpx.Client
+    when http2=True (needs `pip install httpx[http2]`). Only connection failures are
+    retried here; HTTP status handling stays with the callers. `user_agent` may be a
+    callable, resolved on the first request so fake_useragent is not imported up front.
+    """
+
+    DEFAULT_HEADERS = {
+        'Accept': '*/*',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Connection': 'keep-alive',
+    }
+
+    def __init__(self, pool_size=20, http2=False, retries=2, user_agent=None):
+        self.pool_size = max(1, int(pool_size))
+        self.retries = max(0, int(retries))
+        self.http2 = False
+        self.client = None
+        self._user_agent = user_agent
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'connections': 0}
+        self._streams = set()
+        if http2:
+            self.client = self._httpx_client()
+        if self.client is None:
+            self.client = self._requests_session()
+        self.client.headers.update(self.DEFAULT_HEADERS)
+        if not self.http2:
+            self.client.headers['Accept-Encoding'] = accept_encoding()
+
+    def _requests_session(self):
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        retry = Retry(total=self.retries, connect=self.retries, read=False, status=0,
+                      backoff_factor=0.2, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=self.pool_size, max_retries=retry)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _httpx_client(self):
+        import importlib.util
+        try:
+            import httpx
+        except ImportError:
+            httpx = None
+        if httpx is None or importlib.util.find_spec('h2') is None:  # httpx speaks HTTP/2 only with h2
+            print("⚠️ HTTP/2 needs `pip install httpx[http2]`; using requests (HTTP/1.1)")
+            return None
+        limits = httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size)
+        client = httpx.Client(transport=httpx.HTTPTransport(http2=True, limits=limits, retries=self.retries),
+                              follow_redirects=True, event_hooks={'response': [self._track_httpx_stream]})
+        self.http2 = True
+        return client
+
+    def _track_httpx_stream(self, response):
+        # One network stream per connection (HTTP/2 multiplexes many requests over it)
+        stream = response.extensions.get('network_stream')
+        if stream is not None:
+            with self._lock:
+                self._streams.add(id(stream))
+                self.stats['connections'] = len(self._streams)
+
+    @property
+    def headers(self):
+        return self.client.headers
+
+    def get(self, url, **kwargs):
+        if self._user_agent is not None:
+            with self._lock:
+                # Checked again under the lock: concurrent first requests wait for the UA
+                # instead of going out with the client's default one
+                if self._user_agent is not None:
+                    user_agent = self._user_agent
+                    self.client.headers['User-Agent'] = user_agent() if callable(user_agent) else user_agent
+                    self._user_agent = None
+        with self._lock:
+            self.stats['requests'] += 1
+        return self.client.get(url, **kwargs)
+
+    def connection_stats(self):
+        """Requests sent, connections opened and how many requests reused an open connection"""
+        stats = dict(self.stats, client='httpx/h2' if self.http2 else 'requests', pool_size=self.pool_size)
+        if not self.http2:
+            opened = 0
+            adapters = {id(adapter): adapter for adapter in self.client.adapters.values()}
+            for adapter in adapters.values():
+                pools = adapter.poolmanager.pools
+                for key in list(pools.keys()):
+                    pool = pools.get(key)
+                    opened += getattr(pool, 'num_connections', 0) if pool else 0
+            stats['connections'] = opened
+        stats['reused'] = max(0, stats['requests'] - stats['connections'])
+        return stats
+
+    def summary(self):
+        s = self.connection_stats()
+        rate = s['reused'] / s['requests'] * 100 if s['requests'] else 0.0
+        return (f"{s['client']} pool={s['pool_size']} requests={s['requests']} "
+                f"connections={s['connections']} reused={s['reused']} ({rate:.0f}%)")
+
+    def close(self):
+        self.client.close()
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date); None if absent or invalid"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class APIFlowControl:
+    """Pacing shared by every thread that calls the relevance API.
+
+    - token bucket: at most `rate` requests/second with bursts of `burst` (rate None = unlimited)
+    - AIMD concurrency: the in-flight limit halves on a 429/5xx/network error (at most once per
+      `backoff` seconds) and grows back by one after a window of successes, up to max_concurrency
+    - retries: exponential backoff with full jitter, or the server's Retry-After when given;
+      a 429 pauses the bucket so every worker backs off, not only the one that was throttled
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, rate=None, burst=None, max_concurrency=4, retries=3, backoff=0.5,
+                 max_backoff=30.0, max_retry_after=120.0):
+        self.rate = rate
+        self.capacity = float(burst or max(1.0, rate or 1.0))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.retries = max(0, int(retries))
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self.stats = {'requests': 0, 'throttled': 0, 'server_errors': 0, 'network_errors': 0,
+                      'retried': 0, 'gave_up': 0, 'rate_wait_seconds': 0.0,
+                      'concurrency_decreases': 0, 'min_concurrency': self.max_concurrency}
+
+    def _token_wait(self):
+        """Take a token and return 0, or return the seconds until one is available"""
+        now = time.monotonic()
+        if self.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        if now < self.paused_until:
+            return self.paused_until - now
+        if not self.rate:
+            return 0.0
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """Block until a concurrency slot and a rate token are free"""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        while True:
+            with self._cond:
+                wait = self._token_wait()
+                if not wait:
+                    self.stats['requests'] += 1
+                    return
+                self.stats['rate_wait_seconds'] += wait
+            time.sleep(wait)
+
+    def release(self, outcome='ok'):
+        """Free the slot; outcome is 'ok', 'throttled', 'server_errors' or 'network_errors'"""
+        with self._cond:
+            self.in_flight -= 1
+            if outcome == 'ok':
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+            else:
+                self.stats[outcome] += 1
+                now = time.monotonic()
+                if now - self._last_decrease >= self.backoff:
+                    self.limit = max(1.0, self.limit / 2)
+                    self._last_decrease = now
+                    self.stats['concurrency_decreases'] += 1
+                    self.stats['min_concurrency'] = min(self.stats['min_concurrency'], int(self.limit))
+            self._cond.notify_all()
+
+    def retry_delay(self, attempt, retry_after=None):
+        """Delay before retry number attempt+1: Retry-After if the server sent one, else full jitter"""
+        delay = parse_retry_after(retry_after)
+        if delay is not None:
+            return min(delay, self.max_retry_after)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def pause(self, seconds):
+        """Hold back every worker's next request for the given time"""
+        with self._cond:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def count(self, name):
+        with self._cond:
+            self.stats[name] += 1
+
+    def summary(self):
+        s = self.stats
+        return (f"requests={s['requests']} throttled={s['throttled']} server_errors={s['server_errors']} "
+                f"network_errors={s['network_errors']} retried={s['retried']} gave_up={s['gave_up']} "
+                f"concurrency={int(self.limit)}/{self.max_concurrency} (min {s['min_concurrency']}) "
+                f"rate_wait={s['rate_wait_seconds']:.1f}s")
+
+# Relevance API bodies above this size go through the streaming parser in 'auto' mode
+# (below it the whole-document parsers are faster)
+STREAM_PARSE_MIN_BYTES = 256 * 1024
+RELEVANCE_ITEM_PREFIXES = ('data.item', 'ads.item')
+SCALAR_JSON_EVENTS = frozenset({'string', 'number', 'boolean', 'null'})
+
+def stream_relevance_body(body):
+    """(items, metadata) from a relevance API body via ijson, building only the listing objects.
+
+    metadata keeps its scalar fields (next_page_url, totals); facet and filter sections,
+    top-level or nested in metadata, are scanned but never turned into objects. Parsing
+    stops once the item array and metadata are complete, so anything after them is not read.
+    """
+    import ijson
+    from ijson.common import ObjectBuilder
+
+    items = {'data': [], 'ads': []}
+    metadata, metadata_done = None, False
+    builder, building = None, None
+    for prefix, event, value in ijson.parse(body, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if event == 'end_map' and prefix == building:
+                items[building.split('.', 1)[0]].append(builder.value)
+                builder, building = None, None
+        elif event == 'start_map' and prefix in RELEVANCE_ITEM_PREFIXES:
+            builder, building = ObjectBuilder(), prefix
+            builder.event(event, value)
+        elif prefix == 'metadata':
+            if event == 'start_map':
+                metadata = {}
+            elif event == 'end_map':
+                metadata_done = True
+                if items['data'] or items['ads']:
+                    break
+        elif metadata is not None and not metadata_done and event in SCALAR_JSON_EVENTS and prefix.count('.') == 1:
+            metadata[prefix[len('metadata.'):]] = value
+        elif event == 'end_array' and prefix in items and items[prefix] and metadata_done:
+            break
+    return items['data'] or items['ads'], metadata or {}
+
+def load_relevance_body(body):
+    """(items, metadata) from a relevance API body parsed as a whole document (orjson when installed)"""
+    try:
+        import orjson
+        data = orjson.loads(body)
+    except ImportError:
+        data = json.loads(body)
+    items = data.get('data') or data.get('ads') or []
+    metadata = data.get('metadata') or {}
+    return items, metadata
+
+class AsyncFanoutEngine:
+    """Run relevance API calls for a queries x locations matrix concurrently in one process.
+
+    Requests go through the scraper's shared HTTPTransport (one connection pool,
+    one TLS handshake per socket) on a bounded executor, paced by the scraper's APIFlowControl.
+    """
+    def __init__(self, scraper, concurrency=8):
+        self.scraper = scraper
+        self.concurrency = max(1, int(concurrency or 1))
+        self.requests_sent = 0
+
+    async def _fetch_page(self, executor, semaphore, query, location, page):
+        async with semaphore:
+            self.requests_sent += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor, self.scraper.fetch_relevance_page, query, self.scraper.api_size, location, page
+            )
+
+    async def _fetch_cell(self, executor, semaphore, query, location):
+        """Fetch one (query, location) cell, walking pages when pagination is enabled.
+
+        Returns (listings, complete): complete when the cell's last page was reached.
+        """
+        scraper = self.scraper
+        listings = []
+        complete = False
+        seen_ids = set()
+        max_pages = scraper.api_max_pages if scraper.api_paginate else 1
+        for page_index in range(max_pages):
+            page = page_index if scraper.api_paginate else None
+            try:
+                result = await self._fetch_page(executor, semaphore, query, location, page)
+            except Exception as e:
+                print(f"   ❌ Fan-out error for '{query}' @ {location}: {e}")
+                break
+            if result is None:
+                break
+            items, metadata = result
+            for it in items:
+                norm = scraper.normalize_api_listing(it)
+                if norm:
+                    listings.append(norm)
+            if scraper.is_last_relevance_page(items, metadata, scraper.api_size, seen_ids):
+                complete = True
+                break
+        return listings, complete
+
+    async def run_async(self, queries, locations):
+        """Fetch every (query, location) cell and merge the listings in matrix order"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='olx-fanout') as executor:
+            cells = [(q, loc) for q in queries for loc in locations]
+            results = await asyncio.gather(*(self._fetch_cell(executor, semaphore, q, loc) for q, loc in cells))
+        merged = []
+        for listings, _ in results:
+            merged.extend(listings)
+        self.scraper.api_crawl_complete = all(complete for _, complete in results)
+        return merged
+
+    def run(self, queries, locations):
+        """Blocking entry point: fetch the matrix and return one deduplicated result set"""
+        start = time.time()
+        merged = asyncio.run(self.run_async(queries, locations))
+        unique = self.scraper.remove_duplicates(merged)
+        print(f"   🌐 Fan-out: {len(queries)} queries x {len(locations)} locations, "
+              f"{self.requests_sent} requests, {len(merged)} listings ({len(unique)} unique) "
+              f"in {time.time() - start:.2f}s")
+        return unique
+
+class ResponseCache(ABC):
+    """Base class for API response caches: TTL expiry, LRU eviction and ETag/Last-Modified validators.
+
+    Backends store raw response bodies keyed on the normalized request (URL + params)
+    and implement _load, _store, _touch and _evict.
+    """
+    def __init__(self, ttl=300, max_entries=500):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url, params):
+        """Stable cache key for a request: parameter order and value types do not matter"""
+        normalized = json.dumps(
+            {'url': url, 'params': {str(k): str(v) for k, v in (params or {}).items()}},
+            sort_keys=True
+        )
+        return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+    def lookup(self, key):
+        """Return (entry, fresh) for a key, or (None, False); entries carry body, etag, last_modified, stored_at"""
+        with self._lock:
+            entry = self._load(key)
+            if entry is None:
+                return None, False
+            self._touch(key, stored_at=None)
+            return entry, (time.time() - entry['stored_at']) < self.ttl
+
+    def store(self, key, body, etag=None, last_modified=None):
+        """Save a fresh response body and evict least-recently-used entries over the size limit"""
+        with self._lock:
+            self._store(key, body, etag, last_modified, time.time())
+            self.stats['stores'] += 1
+            self.stats['evictions'] += self._evict(self.max_entries)
+
+    def refresh(self, key):
+        """Mark an entry fresh again after the server answered 304 Not Modified"""
+        with self._lock:
+            self._touch(key, stored_at=time.time())
+
+    def record(self, outcome):
+        """Count a hit, miss or revalidation"""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def summary(self):
+        """One-line counter summary for the run report"""
+        st = self.stats
+        return (f"{st['hits']} hits, {st['revalidated']} revalidated, {st['misses']} misses, "
+                f"{st['stores']} stored, {st['evictions']} evicted")
+
+    @abstractmethod
+    def _load(self, key):
+        """Return the stored entry dict for a key, or None"""
+
+    @abstractmethod
+    def _store(self, key, body, etag, last_modified, stored_at):
+        """Write an entry, replacing any previous one for the key"""
+
+    @abstractmethod
+    def _touch(self, key, stored_at=None):
+        """Mark an entry as recently used (and reset its stored_at when given)"""
+
+    @abstractmethod
+    def _evict(self, max_entries):
+        """Drop least-recently-used entries beyond max_entries; return how many were dropped"""
+
+class DirectoryResponseCache(ResponseCache):
+    """Response cache as files in a directory: <key>.body plus <key>.meta.json (file mtime = last access)"""
+    def __init__(self, path='.olx_api_cache', ttl=300, max_entries=500):
+        super().__init__(ttl=ttl, max_entries=max_entries)
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _paths(self, key):
+        base = os.path.join(self.path, key)
+        return base + '.body', base + '.meta.json'
+
+    def _load(self, key):
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                meta['body'] = f.read()
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, key, body, etag, last_modified, stored_at):
+        body_path, meta_path = self._paths(key)
+        with open(body_path, 'wb') as f:
+            f.write(body)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump({'etag': etag, 'last_modified': last_modified, 'stored_at': stored_at}, f)
+
+    def _touch(self, key, stored_at=None):
+        body_path, meta_path = self._paths(key)
+        try:
+            if stored_at is not None:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                meta['stored_at'] = stored_at
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump(meta, f)
+            os.utime(body_path, None)
+        except (OSError, ValueError):
+            pass
+
+    def _evict(self, max_entries):
+        bodies = [e for e in os.scandir(self.path) if e.name.endswith('.body')]
+        excess = len(bodies) - max_entries
+        if excess <= 0:
+            return 0
+        bodies.sort(key=lambda e: e.stat().st_mtime)
+        for entry in bodies[:excess]:
+            for p in self._paths(entry.name[:-len('.body')]):
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+        return excess
+
+class SQLiteResponseCache(ResponseCache):
+    """Response cache in a single SQLite file, LRU-ordered by last access time"""
+    def __init__(self, path='.olx_api_cache.sqlite', ttl=300, max_entries=500):
+        super().__init__(ttl=ttl, max_entries=max_entries)
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT,"
+            " stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+        self.conn.commit()
+
+    def _load(self, key):
+        row = self.conn.execute(
+            "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'body': bytes(row[0]), 'etag': row[1], 'last_modified': row[2], 'stored_at': row[3]}
+
+    def _store(self, key, body, etag, last_modified, stored_at):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses (key, body, etag, last_modified, stored_at, accessed_at)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, sqlite3.Binary(body), etag, last_modified, stored_at, stored_at)
+        )
+        self.conn.commit()
+
+    def _touch(self, key, stored_at=None):
+        now = time.time()
+        if stored_at is not None:
+            self.conn.execute("UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?", (stored_at, now, key))
+        else:
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        self.conn.commit()
+
+    def _evict(self, max_entries):
+        count = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = count - max_entries
+        if excess <= 0:
+            return 0
+        self.conn.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)", (excess,)
+        )
+        self.conn.commit()
+        return excess
+
+def create_response_cache(backend, path=None, ttl=300, max_entries=500):
+    """Build a response cache for the 'dir' or 'sqlite' backend"""
+    if backend == 'sqlite':
+        return SQLiteResponseCache(path or '.olx_api_cache.sqlite', ttl=ttl, max_entries=max_entries)
+    return DirectoryResponseCache(path or '.olx_api_cache', ttl=ttl, max_entries=max_entries)
+
+class CarCoverClassifier:
+    """Decides whether a listing is a true car body cover (not property/parking results).
+
+    Include and exclude phrases are compiled once into two alternation patterns, so each
+    listing costs at most two regex scans instead of one search per phrase.
+    """
+    # Positive phrases that indicate actual car body covers (avoid 'covered')
+    INCLUDE_PATTERNS = [
+        r'\bcar\s*cover\b',
+        r'\bbody\s*cover\b',
+        r'\bcar\s*body\s*cover\b',
+        r'\bwaterproof\s*car\s*cover\b',
+        r'\bcar\s*sheet\s*cover\b',
+    ]
+    # Hard excludes to remove real-estate and irrelevant matches
+    EXCLUDE_PATTERNS = [
+        r'\bbhk\b', r'\bsq\.?ft\b', r'\bapartment\b', r'\bflat\b', r'\bhouse\b',
+        r'\boffice\b', r'\brent\b', r'\bsale\b', r'\bparking\b', r'\bcovered\b',
+        r'\bgaj\b', r'\bshop\b', r'\bcommercial\b', r'\bworkspace\b', r'\bplot\b',
+    ]
+
+    def __init__(self, include_patterns=None, exclude_patterns=None):
+        include = include_patterns or self.INCLUDE_PATTERNS
+        exclude = exclude_patterns or self.EXCLUDE_PATTERNS
+        self.include_re = re.compile('|'.join(f'(?:{p})' for p in include), re.I)
+        self.exclude_re = re.compile('|'.join(f'(?:{p})' for p in exclude), re.I)
+
+    @staticmethod
+    def listing_text(listing):
+        """Lowercased title + description + category text the patterns run against"""
+        return ' '.join([
+            str(listing.get('title') or ''),
+            str(listing.get('description') or ''),
+            str(listing.get('category') or '')
+        ]).lower()
+
+    def matches(self, listing):
+        """True when the listing mentions a car/body cover and none of the excluded terms"""
+        text = self.listing_text(listing)
+        return bool(self.include_re.search(text)) and not self.exclude_re.search(text)
+
+    def classify(self, listings):
+        """Batch form of matches(): one boolean per listing, in order"""
+        include_search = self.include_re.search
+        exclude_search = self.exclude_re.search
+        text_of = self.listing_text
+        results = []
+        for listing in listings:
+            text = text_of(listing)
+            results.append(bool(include_search(text)) and not exclude_search(text))
+        return results
+
+# Listing fields that define a listing's content (scrape time and scores excluded)
+CONTENT_HASH_FIELDS = [
+    'title', 'price_numeric', 'description', 'location', 'locality', 'city',
+    'url', 'image_url', 'category', 'featured', 'posted_at_ts',
+]
+
+def listing_content_hash(listing):
+    """Short stable hash of a listing's content fields, used to detect changed ads"""
+    payload = json.dumps([listing.get(k) for k in CONTENT_HASH_FIELDS], ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+def normalize_listing_url(url):
+    """Canonical ad URL (scheme/host lowercased, no query, fragment or trailing slash); None for non-ad pages"""
+    if not url:
+        return None
+    parts = urlparse(str(url).strip())
+    path = parts.path.rstrip('/')
+    if 'iid-' not in path and '/item/' not in path:
+        return None  # search/category pages are shared by many scraped records
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    return f"{host}{path}"
+
+def listing_fingerprint(listing):
+    """Content key for reposts: normalized title (or description) plus price; None for empty records"""
+    title = ' '.join(re.findall(r'[a-z0-9]+', str(listing.get('title') or '').lower()))
+    price = listing.get('price_numeric') or listing.get('price') or ''
+    if not title and not price:
+        return None
+    text = title or ' '.join(re.findall(r'[a-z0-9]+', str(listing.get('description') or '').lower()))
+    return hashlib.sha1(f"{text}|{price}".encode('utf-8')).digest()[:12]
+
+@functools.lru_cache(maxsize=1 << 16)
+def _shingle_hash(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+
+class MinHashIndex:
+    """Near-duplicate lookup by estimated Jaccard similarity of word unigrams + bigrams.
+
+    Each text gets a MinHash signature of num_perm values; LSH buckets them into bands of
+    rows, so only texts sharing a whole band are compared (sub-quadratic), and candidates
+    count as duplicates when their signatures agree on at least `threshold` of the values.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, min_tokens=4, seed=1):
+        import numpy as np
+
+        self.np = np
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_tokens = min_tokens
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash family over 64-bit shingle hashes (odd multipliers, wrapping arithmetic)
+        self.mul = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.add_ = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+        self.tables = [{} for _ in range(bands)]
+        self.signatures = []
+
+    def signature(self, text):
+        """MinHash signature of a text, or None when it is too short to compare"""
+        np = self.np
+        tokens = re.findall(r'[a-z0-9]+', text.lower())
+        if len(tokens) < self.min_tokens:
+            return None
+        shingles = set(tokens)
+        shingles.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+        hashes = np.fromiter((_shingle_hash(s) for s in shingles), dtype=np.uint64, count=len(shingles))
+        with np.errstate(over='ignore'):
+            permuted = (hashes[:, None] * self.mul + self.add_) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def find(self, signature):
+        """Position of a stored signature at or above the similarity threshold, or None"""
+        checked = set()
+        for table, key in zip(self.tables, self._keys(signature)):
+            for position in table.get(key, ()):
+                if position in checked:
+                    continue
+                checked.add(position)
+                agreement = self.np.count_nonzero(self.signatures[position] == signature) / self.num_perm
+                if agreement >= self.threshold:
+                    return position
+        return None
+
+    def add(self, signature):
+        position = len(self.signatures)
+        self.signatures.append(signature)
+        for table, key in zip(self.tables, self._keys(signature)):
+            table.setdefault(key, []).append(position)
+        return position
+
+class DedupIndex:
+    """Duplicate detector keyed on OLX ad id, then normalized ad URL, then a content fingerprint.
+
+    The fingerprint only applies to listings without an ad id: distinct ads that share a
+    title and price stay separate, since the store and delta track listings by id.
+
+    With near_duplicates=True, reposts whose title + description differ slightly are caught
+    through a MinHashIndex. add() records every key, so chains of partial matches collapse.
+    """
+
+    def __init__(self, near_duplicates=False, threshold=0.8):
+        self.ids = set()
+        self.urls = set()
+        self.fingerprints = set()
+        self.near = MinHashIndex(threshold) if near_duplicates else None
+        self.stats = {'kept': 0, 'id': 0, 'url': 0, 'fingerprint': 0, 'near': 0, 'empty': 0}
+
+    def add(self, listing):
+        """True if the listing is new (and now indexed), False if it duplicates an earlier one"""
+        fingerprint = listing_fingerprint(listing)
+        if fingerprint is None:
+            self.stats['empty'] += 1
+            return False
+        ad_id = str(listing.get('id') or '')
+        ad_id = ad_id if ad_id.isdigit() else None  # positional ids (modern_1, pattern_0_1) are not stable
+        url = normalize_listing_url(listing.get('url'))
+
+        duplicate = None
+        if ad_id and ad_id in self.ids:
+            duplicate = 'id'
+        elif url and url in self.urls:
+            duplicate = 'url'
+        elif not ad_id and fingerprint in self.fingerprints:
+            duplicate = 'fingerprint'
+
+        signature = None
+        if duplicate is None and self.near is not None:
+            signature = self.near.signature(f"{listing.get('title') or ''} {listing.get('description') or ''}")
+            if signature is not None and self.near.find(signature) is not None:
+                duplicate = 'near'
+
+        if ad_id:
+            self.ids.add(ad_id)
+        if url:
+            self.urls.add(url)
+        self.fingerprints.add(fingerprint)
+        if duplicate:
+            self.stats[duplicate] += 1
+            return False
+        if signature is not None:
+            self.near.add(signature)
+        self.stats['kept'] += 1
+        return True
+
+    def summary(self):
+        s = self.stats
+        return (f"kept={s['kept']} dup_id={s['id']} dup_url={s['url']} "
+                f"dup_fingerprint={s['fingerprint']} near_dup={s['near']} empty={s['empty']}")
+
+class ListingStore:
+    """Persistent SQLite store of API listings: upsert by OLX id, price history, per-run change counts.
+
+    Listings are grouped by a scope (query + location); an ad that was active in a scope
+    but is missing from the next successful run of that scope is marked removed.
+    """
+    COLUMNS = [
+        'id', 'title', 'price', 'price_numeric', 'price_formatted', 'location', 'locality',
+        'city', 'url', 'image_url', 'description', 'category', 'featured', 'posted_at',
+        'posted_at_ts', 'scraped_at', 'source',
+    ]
+
+    def __init__(self, path='olx_listings.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS listings (
+                id TEXT PRIMARY KEY,
+                title TEXT, price TEXT, price_numeric INTEGER, price_formatted TEXT,
+                location TEXT, locality TEXT, city TEXT, url TEXT, image_url TEXT,
+                description TEXT, category TEXT, featured INTEGER, posted_at TEXT,
+                posted_at_ts INTEGER, scraped_at TEXT, source TEXT,
+                scope TEXT, content_hash TEXT,
+                first_seen REAL, last_seen REAL, removed_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_listings_city ON listings(city);
+            CREATE INDEX IF NOT EXISTS idx_listings_price ON listings(price_numeric);
+            CREATE INDEX IF NOT EXISTS idx_listings_posted ON listings(posted_at_ts);
+            CREATE INDEX IF NOT EXISTS idx_listings_scope ON listings(scope, removed_at);
+            CREATE TABLE IF NOT EXISTS listing_history (
+                id TEXT NOT NULL, observed_at REAL NOT NULL, change TEXT NOT NULL,
+                price_numeric INTEGER, content_hash TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_history_id ON listing_history(id, observed_at);
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT, scope TEXT, run_at REAL,
+                total INTEGER, new INTEGER, changed INTEGER, unchanged INTEGER, removed INTEGER
+            );
+        """)
+        self.conn.commit()
+
+    def upsert_run(self, listings, scope='', complete=True):
+        """Upsert one run's listings and return {'new', 'changed', 'unchanged', 'removed', 'total'}"""
+        run = self.begin_run(scope)
+        for listing in listings:
+            self.upsert(run, listing)
+        return self.finish_run(run, complete=complete)
+
+    def begin_run(self, scope=''):
+        """Start an incremental run; pass the returned handle to upsert() and finish_run()"""
+        return {'scope': scope, 'run_at': time.time(),
+                'counts': {'new': 0, 'changed': 0, 'unchanged': 0, 'removed': 0, 'total': 0}}
+
+    def upsert(self, run, listing):
+        """Insert or update one listing within a run; returns 'new', 'changed', 'unchanged' or None"""
+        listing_id = str(listing.get('id') or '')
+        if not listing_id:
+            return None
+        run_at, counts = run['run_at'], run['counts']
+        content_hash = listing_content_hash(listing)
+        with self._lock:
+            cur = self.conn.cursor()
+            row = cur.execute(
+                "SELECT content_hash, removed_at FROM listings WHERE id = ?", (listing_id,)
+            ).fetchone()
+            if row is None:
+                change = 'new'
+            elif row['content_hash'] != content_hash or row['removed_at'] is not None:
+                change = 'changed'
+            else:
+                change = 'unchanged'
+            counts['total'] += 1
+            counts[change] += 1
+
+            values = [listing.get(c) for c in self.COLUMNS]
+            values[0] = listing_id
+            values[self.COLUMNS.index('featured')] = int(bool(listing.get('featured')))
+            cur.execute(
+                f"INSERT INTO listings ({', '.join(self.COLUMNS)}, scope, content_hash, first_seen, last_seen, removed_at)"
+                f" VALUES ({', '.join('?' * len(self.COLUMNS))}, ?, ?, ?, ?, NULL)"
+                " ON CONFLICT(id) DO UPDATE SET "
+                + ', '.join(f"{c} = excluded.{c}" for c in self.COLUMNS[1:]) +
+                ", scope = excluded.scope, content_hash = excluded.content_hash,"
+                " last_seen = excluded.last_seen, removed_at = NULL",
+                values + [run['scope'], content_hash, run_at, run_at]
+            )
+            if change != 'unchanged':
+                cur.execute(
+                    "INSERT INTO listing_history (id, observed_at, change, price_numeric, content_hash) VALUES (?, ?, ?, ?, ?)",
+                    (listing_id, run_at, change, listing.get('price_numeric'), content_hash)
+                )
+        return change
+
+    def finish_run(self, run, complete=True):
+        """Mark unseen ads in the run's scope as removed, record the run and return its counts.
+
+        Pass complete=False for a partial crawl (failed pages, exhausted budget, page cap):
+        ads it did not see may still be listed, so none are marked removed.
+        """
+        scope, run_at, counts = run['scope'], run['run_at'], run['counts']
+        with self._lock:
+            cur = self.conn.cursor()
+            # Ads active in this scope that this run did not see have disappeared
+            removed_ids = [r['id'] for r in cur.execute(
+                "SELECT id FROM listings WHERE scope = ? AND removed_at IS NULL AND last_seen < ?", (scope, run_at)
+            ).fetchall()] if complete else []
+            for listing_id in removed_ids:
+                cur.execute("UPDATE listings SET removed_at = ? WHERE id = ?", (run_at, listing_id))
+                cur.execute(
+                    "INSERT INTO listing_history (id, observed_at, change) VALUES (?, ?, 'removed')", (listing_id, run_at)
+                )
+            counts['removed'] = len(removed_ids)
+
+            cur.execute(
+                "INSERT INTO runs (scope, run_at, total, new, changed, unchanged, removed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (scope, run_at, counts['total'], counts['new'], counts['changed'], counts['unchanged'], counts['removed'])
+            )
+            self.conn.commit()
+        return counts
+
+    def query(self, city=None, min_price=None, max_price=None, posted_since=None, include_removed=False, limit=100):
+        """Stored listings matching the filters, newest first, as dicts"""
+        clauses, args = [], []
+        if city:
+            clauses.append("city = ?")
+            args.append(city)
+        if min_price is not None:
+            clauses.append("price_numeric >= ?")
+            args.append(min_price)
+        if max_price is not None:
+            clauses.append("price_numeric <= ?")
+            args.append(max_price)
+        if posted_since is not None:
+            clauses.append("posted_at_ts >= ?")
+            args.append(posted_since)
+        if not include_removed:
+            clauses.append("removed_at IS NULL")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM listings {where} ORDER BY posted_at_ts DESC LIMIT ?", args + [limit]
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def history(self, listing_id):
+        """Change history (new/changed/removed with price) of one listing, oldest first"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT observed_at, change, price_numeric, content_hash FROM listing_history WHERE id = ? ORDER BY observed_at",
+                (str(listing_id),)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+class DeltaIndex:
+    """Compact previous-run index for delta output: scope -> {id: [content hash, price_numeric, posted_at_ts]}.
+
+    A run reports ads that are new, whose price changed, whose other content changed, and
+    ads of the same scope that disappeared since the previous run. Stored as one small JSON file.
+    """
+
+    def __init__(self, path=os.path.join('olx_scraping_results', 'delta_index.json')):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+        self.data.setdefault('scopes', {})
+        self._lock = threading.Lock()  # daemon jobs may finish runs concurrently
+
+    def begin_run(self, scope=''):
+        """Start a run; pass the returned handle to observe() and finish_run()"""
+        previous = self.data['scopes'].get(scope) or {}
+        return {'scope': scope, 'run_at': time.time(), 'previous': previous, 'current': {},
+                'new': [], 'price_changed': [], 'updated': []}
+
+    def observe(self, run, listing):
+        """Compare one listing with the previous run; returns 'new', 'price_changed', 'updated' or None"""
+        listing_id = str(listing.get('id') or '')
+        if not listing_id:
+            return None
+        entry = [listing_content_hash(listing), listing.get('price_numeric'), listing.get('posted_at_ts')]
+        run['current'][listing_id] = entry
+        previous = run['previous'].get(listing_id)
+        if previous is None:
+            change = 'new'
+        elif previous[0] == entry[0]:
+            return None
+        elif previous[1] != entry[1]:
+            change = 'price_changed'
+        else:
+            change = 'updated'
+        record = listing_to_dict(listing)
+        if previous is not None:
+            record['previous_price_numeric'] = previous[1]
+        run[change].append(record)
+        return change
+
+    def finish_run(self, run, complete=True):
+        """Record the run as the new baseline and return the delta (with removed ads).
+
+        A partial crawl (complete=False) reports no removals and keeps the unseen ads in the
+        baseline, so they are not reported as new when the next complete run sees them.
+        """
+        removed = [
+            {'id': listing_id, 'price_numeric': entry[1], 'posted_at_ts': entry[2]}
+            for listing_id, entry in run['previous'].items() if listing_id not in run['current']
+        ] if complete else []
+        baseline = run['current'] if complete else {**run['previous'], **run['current']}
+        with self._lock:
+            previous_run_at = self.data.get('run_at', {}).get(run['scope'])
+            self.data['scopes'][run['scope']] = baseline
+            self.data.setdefault('run_at', {})[run['scope']] = run['run_at']
+            self.save()
+        return {
+            'delta_metadata': {
+                'scope': run['scope'],
+                'run_at': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run['run_at'])),
+                'previous_run_at': (time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(previous_run_at))
+                                    if previous_run_at else None),
+                'tracked_listings': len(run['current']),
+                'complete': complete,
+                'counts': {'new': len(run['new']), 'price_changed': len(run['price_changed']),
+                           'updated': len(run['updated']), 'removed': len(removed)},
+            },
+            'new': run['new'],
+            'price_changed': run['price_changed'],
+            'updated': run['updated'],
+            'removed': removed,
+        }
+
+    def save(self):
+        """Atomically rewrite the index file"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+# Listing fields in output order (see README "Output Schema")
+LISTING_FIELDS = [
+    'id', 'title', 'price', 'price_numeric', 'price_formatted', 'location', 'locality', 'city',
+    'url', 'image_url', 'description', 'category', 'featured', 'posted_at', 'posted_at_ts',
+    'scraped_at', 'source', 'quality_score',
+]
+
+class Listing:
+    """Compact listing record: fixed __slots__ instead of a ~18-key dict per listing.
+
+    Supports the dict-style access the pipeline already uses (get, [], in) and is
+    converted to a plain dict only at output time via to_dict(). Unset fields behave
+    like missing dict keys.
+    """
+    __slots__ = tuple(LISTING_FIELDS) + ('date_posted',)
+    _FIELD_SET = frozenset(__slots__)  # O(1) membership for the hot get()/in paths
+
+    def __init__(self, **fields):
+        for key, value in fields.items():
+            self[key] = value
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self._FIELD_SET else default
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(f"Listing has no field {key!r}")
+
+    def __contains__(self, key):
+        return key in self._FIELD_SET and hasattr(self, key)
+
+    def keys(self):
+        return [k for k in self.__slots__ if hasattr(self, k)]
+
+    def items(self):
+        return [(k, getattr(self, k)) for k in self.__slots__ if hasattr(self, k)]
+
+    def to_dict(self):
+        """Plain dict of the fields that are set, in schema order"""
+        return dict(self.items())
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Listing from a dict, ignoring keys outside the schema"""
+        listing = cls()
+        for key, value in data.items():
+            if key in cls.__slots__:
+                setattr(listing, key, value)
+        return listing
+
+    def __repr__(self):
+        return f"Listing({self.to_dict()!r})"
+
+def listing_to_dict(listing):
+    """Output-time conversion for Listing records (dicts pass through unchanged)"""
+    return listing.to_dict() if isinstance(listing, Listing) else listing
+
+def open_text_output(path, compression=None):
+    """Open a text file for writing, optionally through gzip or zstd compression"""
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd output needs the zstandard package: pip install zstandard")
+        raw = open(path, 'wb')
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw, closefd=True), encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+class StreamingListingWriter:
+    """Write listings record by record as JSON Lines (and optionally CSV) without holding them in memory"""
+    EXTENSIONS = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+
+    def __init__(self, base_path, compression=None, write_csv=True):
+        suffix = self.EXTENSIONS[compression]
+        self.jsonl_path = f"{base_path}.jsonl{suffix}"
+        self.csv_path = f"{base_path}.csv{suffix}" if write_csv else None
+        self.count = 0
+        self._jsonl = open_text_output(self.jsonl_path, compression)
+        self._csv_file = None
+        self._csv = None
+        if self.csv_path:
+            self._csv_file = open_text_output(self.csv_path, compression)
+            if compression is None:
+                self._csv_file.write('\ufeff')  # same utf-8-sig BOM as the DataFrame CSV
+            self._csv = csv.DictWriter(self._csv_file, fieldnames=LISTING_FIELDS, extrasaction='ignore')
+            self._csv.writeheader()
+
+    def write(self, listing):
+        """Append one listing to every output"""
+        record = listing_to_dict(listing)
+        self._jsonl.write(json.dumps(record, ensure_ascii=False))
+        self._jsonl.write('\n')
+        if self._csv:
+            self._csv.writerow(record)
+        self.count += 1
+
+    def close(self):
+        for f in (self._jsonl, self._csv_file):
+            if f:
+                f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+def listing_arrow_schema():
+    """Explicit Arrow schema for listing records (README listings[] fields)"""
+    import pyarrow as pa
+    categorical = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('id', pa.string()),
+        ('title', pa.string()),
+        ('price', pa.string()),
+        ('price_numeric', pa.int64()),
+        ('price_formatted', pa.string()),
+        ('location', categorical),
+        ('locality', pa.string()),
+        ('city', categorical),
+        ('url', pa.string()),
+        ('image_url', pa.string()),
+        ('description', pa.string()),
+        ('category', pa.string()),
+        ('featured', pa.bool_()),
+        ('posted_at', pa.string()),
+        ('posted_at_ts', pa.timestamp('s', tz='UTC')),
+        ('scraped_at', pa.timestamp('s')),  # local wall-clock time, as in the JSON output
+        ('source', categorical),
+        ('quality_score', pa.int16()),
+    ])
+
+class ParquetListingWriter:
+    """Write listings to a Parquet dataset partitioned by scrape date (scrape_date=YYYY-MM-DD/).
+
+    Rows are buffered and flushed as row groups every batch_size listings, so it can sit
+    next to StreamingListingWriter in streaming runs.
+    """
+    TEXT_FIELDS = {
+        'id', 'title', 'price', 'price_formatted', 'location', 'locality', 'city', 'url',
+        'image_url', 'description', 'category', 'posted_at', 'source',
+    }
+
+    def __init__(self, root_dir, batch_size=5000, file_prefix=None):
+        import pyarrow  # fail early with ImportError when pyarrow is missing
+        self.pa = pyarrow
+        import pyarrow.parquet as pq
+        self.pq = pq
+        self.root_dir = root_dir
+        self.batch_size = batch_size
+        self.file_prefix = file_prefix or f"listings_{int(time.time())}"
+        self.schema = listing_arrow_schema()
+        self.count = 0
+        self.paths = []
+        self._buffers = {}  # scrape_date -> list of rows
+        self._writers = {}  # scrape_date -> pq.ParquetWriter
+
+    @staticmethod
+    def _scraped_datetime(listing):
+        try:
+            return datetime.strptime(listing.get('scraped_at') or '', "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return datetime.now().replace(microsecond=0)
+
+    @staticmethod
+    def _as_int(value):
+        try:
+            return int(value) if value is not None and value != '' else None
+        except (TypeError, ValueError):
+            return None
+
+    def write(self, listing):
+        """Buffer one listing, flushing its date partition when the batch is full"""
+        scraped = self._scraped_datetime(listing)
+        posted_ts = self._as_int(listing.get('posted_at_ts'))
+        row = {}
+        for field in self.schema:
+            value = listing.get(field.name)
+            if value is not None and not isinstance(value, str) and field.name in self.TEXT_FIELDS:
+                value = str(value)
+            row[field.name] = value
+        row['price_numeric'] = self._as_int(listing.get('price_numeric'))
+        row['featured'] = bool(listing.get('featured')) if listing.get('featured') is not None else None
+        row['posted_at_ts'] = datetime.fromtimestamp(posted_ts, tz=timezone.utc) if posted_ts else None
+        row['scraped_at'] = scraped
+        row['quality_score'] = self._as_int(listing.get('quality_score'))
+        partition = scraped.strftime('%Y-%m-%d')
+        buffer = self._buffers.setdefault(partition, [])
+        buffer.append(row)
+        self.count += 1
+        if len(buffer) >= self.batch_size:
+            self._flush(partition)
+
+    def _flush(self, partition):
+        rows = self._buffers.get(partition)
+        if not rows:
+            return
+        pa = self.pa
+        columns = []
+        for field in self.schema:
+            values = [r[field.name] for r in rows]
+            if pa.types.is_dictionary(field.type):
+                columns.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                columns.append(pa.array(values, type=field.type))
+        table = pa.Table.from_arrays(columns, schema=self.schema)
+        writer = self._writers.get(partition)
+        if writer is None:
+            part_dir = os.path.join(self.root_dir, f"scrape_date={partition}")
+            os.makedirs(part_dir, exist_ok=True)
+            path = os.path.join(part_dir, f"{self.file_prefix}.parquet")
+            writer = self.pq.ParquetWriter(path, self.schema, compression='zstd')
+            self._writers[partition] = writer
+            self.paths.append(path)
+        writer.write_table(table)
+        self._buffers[partition] = []
+
+    def close(self):
+        for partition in list(self._buffers):
+            self._flush(partition)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+class SoupHTMLBackend:
+    """BeautifulSoup tree walker (pure-Python html.parser unless another parser is given)"""
+    name = 'bs4'
+
+    def __init__(self, parser='html.parser'):
+        from bs4 import BeautifulSoup, Tag
+        self._soup_cls = BeautifulSoup
+        self._tag_cls = Tag
+        self.parser = parser
+
+    def parse(self, html):
+        return self._soup_cls(html, self.parser)
+
+    def walk(self, tree):
+        """Yield ('start'|'end', element) in document order"""
+        Tag = self._tag_cls
+        stack = [(tree, iter(tree.children))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if node is not tree:
+                    yield 'end', node
+                continue
+            if isinstance(child, Tag):
+                yield 'start', child
+                stack.append((child, iter(child.children)))
+
+    def tag(self, node):
+        return node.name
+
+    def attr(self, node, name):
+        value = node.get(name)
+        return ' '.join(value) if isinstance(value, list) else value
+
+    def text(self, node):
+        return node.get_text()
+
+class LxmlHTMLBackend:
+    """lxml (libxml2) tree walker using iterwalk start/end events"""
+    name = 'lxml'
+
+    def __init__(self):
+        from lxml import etree, html as lxml_html
+        self._etree = etree
+        self._html = lxml_html
+
+    def parse(self, html):
+        return self._html.document_fromstring(html)
+
+    def walk(self, tree):
+        for event, node in self._etree.iterwalk(tree, events=('start', 'end')):
+            if isinstance(node.tag, str):  # skip comments and processing instructions
+                yield event, node
+
+    def tag(self, node):
+        return node.tag
+
+    def attr(self, node, name):
+        return node.get(name)
+
+    def text(self, node):
+        return node.text_content()
+
+class SelectolaxHTMLBackend:
+    """selectolax (lexbor) tree walker"""
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_cls = LexborHTMLParser
+
+    def parse(self, html):
+        return self._parser_cls(html)
+
+    def walk(self, tree):
+        root = tree.root
+        if root is None:
+            return
+        yield 'start', root
+        stack = [(root, root.child)]
+        while stack:
+            node, child = stack.pop()
+            while child is not None and child.tag.startswith('-'):  # text/comment nodes
+                child = child.next
+            if child is None:
+                yield 'end', node
+                continue
+            stack.append((node, child.next))
+            yield 'start', child
+            stack.append((child, child.child))
+
+    def tag(self, node):
+        return node.tag
+
+    def attr(self, node, name):
+        return node.attributes.get(name)
+
+    def text(self, node):
+        return node.text(deep=True)
+
+class HTMLExtractionEngine:
+    """Offline listing extraction from raw OLX results-page HTML.
+
+    The page is parsed once by the chosen backend and every listing card
+    (data-aut-id="itemBox...") is collected in a single start/end traversal of the tree.
+    extract() returns raw card field dicts; ImprovedOLXScraper turns them into listings.
+    """
+    BACKENDS = {
+        'lxml': LxmlHTMLBackend,
+        'selectolax': SelectolaxHTMLBackend,
+        'bs4': SoupHTMLBackend,
+    }
+    # data-aut-id of elements inside a card -> card field name
+    FIELD_IDS = {
+        'itemTitle': 'title',
+        'itemPrice': 'price',
+        'item-location': 'location',
+        'itemDetails': 'details',
+    }
+
+    def __init__(self, backend='auto'):
+        self.backend = self.create_backend(backend)
+
+    @classmethod
+    def available_backends(cls):
+        """Backend names whose parser library is installed, fastest first"""
+        names = []
+        for name, backend_cls in cls.BACKENDS.items():
+            try:
+                backend_cls()
+                names.append(name)
+            except ImportError:
+                continue
+        return names
+
+    @classmethod
+    def create_backend(cls, backend='auto'):
+        if backend != 'auto':
+            return cls.BACKENDS[backend]()
+        for backend_cls in cls.BACKENDS.values():
+            try:
+                return backend_cls()
+            except ImportError:
+                continue
+        raise ImportError("No HTML parser available: pip install lxml or beautifulsoup4")
+
+    def extract(self, html):
+        """Parse html once and return one field dict per listing card, in page order"""
+        backend = self.backend
+        tree = backend.parse(html)
+        cards = []
+        card = None
+        card_depth = None
+        depth = 0
+        for event, node in backend.walk(tree):
+            if event == 'end':
+                depth -= 1
+                if card is not None and depth == card_depth:
+                    cards.append(card)
+                    card = None
+                continue
+            depth += 1
+            aut_id = backend.attr(node, 'data-aut-id') or ''
+            if card is None:
+                if aut_id.startswith('itemBox'):
+                    card = {}
+                    card_depth = depth - 1
+                continue
+            field = self.FIELD_IDS.get(aut_id)
+            if field and field not in card:
+                card[field] = ' '.join(backend.text(node).split())
+                continue
+            tag = backend.tag(node)
+            if tag == 'a' and 'href' not in card:
+                href = backend.attr(node, 'href')
+                if href:
+                    card['href'] = href
+            elif tag == 'img' and 'image_url' not in card:
+                src = backend.attr(node, 'src') or backend.attr(node, 'data-src')
+                if src:
+                    card['image_url'] = src
+                alt = backend.attr(node, 'alt')
+                if alt:
+                    card['alt'] = alt.strip()
+        return cards
+
+class PageSnapshot:
+    """Immutable capture of one loaded page (source, URL, title) shared by all extraction strategies.
+
+    Derived views - BeautifulSoup tree, extracted listing cards and
+    regex hits - are computed on first use and cached on the snapshot, so a results page
+    is fetched from WebDriver and parsed at most once.
+    """
+    __slots__ = ('_html', '_url', '_title', '_cache')
+
+    def __init__(self, html, url='', title=''):
+        object.__setattr__(self, '_html', html or '')
+        object.__setattr__(self, '_url', url or '')
+        object.__setattr__(self, '_title', title or '')
+        object.__setattr__(self, '_cache', {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PageSnapshot is immutable")
+
+    @classmethod
+    def from_driver(cls, driver):
+        """Capture the driver's current page in one pass"""
+        return cls(driver.page_source, driver.current_url, driver.title)
+
+    @property
+    def html(self):
+        return self._html
+
+    @property
+    def url(self):
+        return self._url
+
+    @property
+    def title(self):
+        return self._title
+
+    def _cached(self, key, compute):
+        cache = self._cache
+        if key not in cache:
+            cache[key] = compute()
+        return cache[key]
+
+    @property
+    def soup(self):
+        """BeautifulSoup tree of the page (html.parser)"""
+        def parse():
+            from bs4 import BeautifulSoup
+            return BeautifulSoup(self._html, 'html.parser')
+        return self._cached('soup', parse)
+
+    def cards(self, engine):
+        """Listing-card fields extracted by an HTMLExtractionEngine (cached per backend)"""
+        return self._cached(('cards', engine.backend.name), lambda: engine.extract(self._html))
+
+    def findall(self, pattern, flags=0):
+        """re.findall over the page source, cached per pattern"""
+        return self._cached(('findall', pattern, flags), lambda: re.findall(pattern, self._html, flags))
+
+    def count(self, pattern, flags=0):
+        """Number of regex hits in the page source"""
+        return len(self.findall(pattern, flags))
+
+# Selector chains tried inside each listing card, in priority order. Shared by the
+# per-element Selenium path and the single-call BULK_DOM_EXTRACT_JS snippet.
+CARD_FIELD_SELECTORS = {
+    'title': [
+        '[data-aut-id="itemTitle"]', 'h1', 'h2', 'h3', 'h4',
+        '.title', '[class*="title"]', '[class*="Title"]',
+        'a[title]', 'span[title]'
+    ],
+    'price': [
+        '[data-aut-id="itemPrice"]', '.price', '[class*="price"]',
+        '[class*="Price"]', '.amount', '.cost'
+    ],
+    'location': [
+        '[data-aut-id="itemLocation"]', '.location', '[class*="location"]',
+        '[class*="Location"]', '.place', '.city'
+    ],
+}
+
+# Evaluates every card selector and field selector in the page and returns plain JSON:
+# {selector, total, cards: [{titles, prices, locations, href, image, text}]}. The first
+# container selector with more than `minCount` matches wins, like the per-element loop.
+BULK_DOM_EXTRACT_JS = """
+var containers = arguments[0], minCount = arguments[1], limit = arguments[2], fields = arguments[3];
+function first(root, sel) { try { return root.querySelector(sel); } catch (e) { return null; } }
+function text(el) { return el ? (el.innerText || el.textContent || '') : ''; }
+function candidates(card, sels, read) {
+    return sels.map(function (sel) { var el = first(card, sel); return el ? read(el) : null; });
+}
+function titleOf(el) { return el.getAttribute('title') || text(el) || el.getAttribute('alt') || ''; }
+for (var c = 0; c < containers.length; c++) {
+    var cards;
+    try { cards = document.querySelectorAll(containers[c]); } catch (e) { continue; }
+    if (cards.length <= minCount) { continue; }
+    var out = [];
+    for (var i = 0; i < cards.length && i < limit; i++) {
+        var card = cards[i], link = first(card, 'a[href]'), img = first(card, 'img');
+        out.push({
+            titles: candidates(card, fields.title, titleOf),
+            prices: candidates(card, fields.price, text),
+            locations: candidates(card, fields.location, text),
+            href: link ? (link.href || '') : '',
+            image: img ? (img.src || img.getAttribute('data-src') || img.getAttribute('data-lazy-src') || '') : '',
+            text: text(card)
+        });
+    }
+    return {selector: containers[c], total: cards.length, cards: out};
+}
+return null;
+"""
+
+# Containers that hold rendered listing cards; the first one with more than one match counts.
+LISTING_CONTAINER_SELECTORS = [
+    '[data-aut-id="itemBox"]',
+    '.item', '.listing', '.ad-item',
+    '[class*="item"]', '[class*="listing"]',
+    'article', '.card'
+]
+
+# One round-trip readiness probe: [readyState, listing container, card count, resources loaded].
+PAGE_PROBE_JS = """
+var sels = arguments[0];
+for (var i = 0; i < sels.length; i++) {
+    var n = 0;
+    try { n = document.querySelectorAll(sels[i]).length; } catch (e) { continue; }
+    if (n > 1) {
+        return [document.readyState, sels[i], n, performance.getEntriesByType('resource').length];
+    }
+}
+return [document.readyState, null, 0, performance.getEntriesByType('resource').length];
+"""
+
+# Elements only present on bot-protection challenge pages (Cloudflare, DDoS-Guard, captchas)
+PROTECTION_SELECTORS = [
+    '#challenge-form', '#challenge-stage', '#cf-challenge-running', '.cf-browser-verification',
+    'iframe[src*="challenges.cloudflare.com"]', '#ddg-captcha', '.ddg-captcha',
+    'iframe[src*="recaptcha"]', 'iframe[src*="hcaptcha"]', '.g-recaptcha', '.h-captcha',
+]
+
+# Challenge check without transferring page_source: arguments are (phrases, selectors);
+# looks at the title, the first 2000 characters of visible text and visible challenge elements.
+PROTECTION_PROBE_JS = """
+var phrases = arguments[0], sels = arguments[1];
+var text = ((document.title || '') + ' ' + ((document.body && document.body.innerText) || '').slice(0, 2000)).toLowerCase();
+for (var i = 0; i < phrases.length; i++) {
+    if (text.indexOf(phrases[i]) !== -1) { return true; }
+}
+for (var j = 0; j < sels.length; j++) {
+    var el = null;
+    try { el = document.querySelector(sels[j]); } catch (e) {}
+    // Visible elements only: normal OLX pages carry a hidden zero-size reCAPTCHA iframe
+    if (el && el.offsetWidth > 0 && el.offsetHeight > 0) { return true; }
+}
+return false;
+"""
+
+# URL patterns (Network.setBlockedURLs wildcards) for resources the scraper never reads.
+# Image URLs are still taken from the DOM; only the downloads are skipped.
+BLOCKED_RESOURCE_PATTERNS = {
+    'images': ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico'],
+    'media': ['*.mp4', '*.webm', '*.m3u8', '*.mp3', '*.ogg'],
+    'fonts': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'analytics': [
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*googlesyndication.com*', '*googleadservices.com*', '*facebook.net*',
+        '*hotjar.com*', '*clarity.ms*', '*newrelic.com*', '*nr-data.net*',
+        '*branch.io*', '*criteo.com*', '*taboola.com*', '*appsflyer.com*',
+    ],
+}
+
+# Page weight from the Resource Timing API: [bytes transferred, requests, zero-size entries, load ms].
+# Zero-size entries are memory-cache hits, cross-origin resources without Timing-Allow-Origin and
+# failed requests alike; Resource Timing cannot tell blocked requests apart.
+PAGE_WEIGHT_JS = """
+var entries = performance.getEntriesByType('resource'), bytes = 0, zeroSize = 0;
+var nav = performance.getEntriesByType('navigation')[0];
+for (var i = 0; i < entries.length; i++) {
+    bytes += entries[i].transferSize || 0;
+    if (!entries[i].transferSize && !entries[i].decodedBodySize) { zeroSize++; }
+}
+if (nav) { bytes += nav.transferSize || 0; }
+var loadMs = nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd || nav.responseEnd) : 0;
+return [bytes, entries.length + (nav ? 1 : 0), zeroSize, Math.round(loadMs)];
+"""
+
+# Latency budget in seconds for each Selenium stage (overridable with --stage-budget)
+DEFAULT_STAGE_BUDGETS = {
+    'load': 15,
+    'protection': 30,
+    'content': 10,
+    'simulation': 20,
+}
+
+# Resolved chromedriver binary, remembered across runs so webdriver-manager is only
+# consulted when the cached binary disappears.
+CHROMEDRIVER_PATH_FILE = '.olx_chromedriver_path'
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+
+def cached_chromedriver_path():
+    """Path of a chromedriver binary, installing through webdriver-manager at most once"""
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path and os.path.exists(_chromedriver_path):
+            return _chromedriver_path
+        try:
+            with open(CHROMEDRIVER_PATH_FILE, 'r', encoding='utf-8') as f:
+                path = f.read().strip()
+            if path and os.path.exists(path):
+                _chromedriver_path = path
+                return path
+        except OSError:
+            pass
+        from webdriver_manager.chrome import ChromeDriverManager
+        _chromedriver_path = ChromeDriverManager().install()
+        try:
+            with open(CHROMEDRIVER_PATH_FILE, 'w', encoding='utf-8') as f:
+                f.write(_chromedriver_path)
+        except OSError:
+            pass
+        return _chromedriver_path
+
+
+class BrowserPool:
+    """Browser sessions checked out per run and reset between uses.
+
+    `factory` returns a new WebDriver (or None). acquire()/release() are the only way to
+    borrow one; browsers are launched lazily, when acquire() finds none idle (up to `size`),
+    and start() pre-launches them all.
+    Use as a context manager so every browser is quit on exit, including after errors.
+    """
+
+    def __init__(self, factory, size=1):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._launch_lock = threading.Lock()  # one launch at a time: chromedriver patching is not thread-safe
+        self._closed = False
+        self.stats = {'launches': 0, 'checkouts': 0, 'resets': 0, 'replacements': 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _launch(self):
+        driver = self.factory()
+        if driver is None:
+            return None
+        with self._lock:
+            self._all.append(driver)
+            self.stats['launches'] += 1
+        return driver
+
+    def start(self):
+        """Launch browsers until the pool is full (sequential: chromedriver patching is not thread-safe)"""
+        while len(self._all) < self.size:
+            with self._launch_lock:
+                driver = self._launch()
+            if driver is None:
+                break
+            self._idle.put(driver)
+        print(f"🧰 Browser pool ready: {len(self._all)}/{self.size} sessions")
+        return len(self._all)
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _healthy(self, driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def reset(self, driver):
+        """Clear cookies and storage and park the browser on a blank page"""
+        try:
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        except Exception:
+            pass
+        driver.delete_all_cookies()
+        driver.get('about:blank')
+        self.stats['resets'] += 1
+
+    def acquire(self, timeout=None):
+        """Take a live browser out of the pool, launching one (up to size) or relaunching dead sessions"""
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            driver = None
+        if driver is None:
+            with self._launch_lock:
+                if len(self._all) < self.size:
+                    driver = self._launch()
+        if driver is None and self._all:
+            # Every browser is checked out: wait for one to come back
+            try:
+                driver = self._idle.get(timeout=timeout)
+            except queue.Empty:
+                driver = None
+        if driver is not None and not self._healthy(driver):
+            self._discard(driver)
+            driver = None
+        if driver is None:
+            with self._launch_lock:
+                driver = self._launch()
+            if driver is None:
+                raise RuntimeError("could not launch a browser")
+            self.stats['replacements'] += 1
+        self.stats['checkouts'] += 1
+        return driver
+
+    def release(self, driver):
+        """Reset a borrowed browser and return it to the pool (quit it if the reset fails)"""
+        try:
+            if self._closed:
+                raise RuntimeError("pool closed")
+            self.reset(driver)
+            self._idle.put(driver)
+        except Exception:
+            self._discard(driver)
+
+    def close(self):
+        """Quit every browser the pool launched"""
+        self._closed = True
+        with self._lock:
+            drivers, self._all = list(self._all), []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        if drivers:
+            print(f"🔒 Browser pool closed ({len(drivers)} sessions)")
+
+    def summary(self):
+        s = self.stats
+        return (f"launches={s['launches']} checkouts={s['checkouts']} "
+                f"resets={s['resets']} replacements={s['replacements']}")
+
+
+def json_bool(value):
+    """Strict boolean for config files: only JSON true/false, so "false" or 0 is an error rather than truthy"""
+    if not isinstance(value, bool):
+        raise ValueError(f"expected true or false, got {value!r}")
+    return value
+
+
+class DaemonJob:
+    """One scheduled search from the daemon jobs file, with its own interval, jitter and scraper settings"""
+
+    # jobs-file key -> (ImprovedOLXScraper attribute, type)
+    SETTINGS = {
+        'query': ('api_query', str),
+        'location': ('api_location', int),
+        'size': ('api_size', int),
+        'paginate': ('api_paginate', json_bool),
+        'max_pages': ('api_max_pages', int),
+        'concurrency': ('api_concurrency', int),
+        'queries': ('fanout_queries', lambda values: [str(v) for v in values]),
+        'locations': ('fanout_locations', lambda values: [int(v) for v in values]),
+        'no_filter': ('no_filter', json_bool),
+        'sort': ('sort_by', str),
+        'featured_first': ('featured_first', json_bool),
+        'top': ('top_n', int),
+    }
+
+    def __init__(self, name, interval, jitter=0.0, browser=False, settings=None):
+        self.name = name
+        self.interval = interval
+        self.jitter = jitter
+        self.browser = browser  # True: full run (API first, then Selenium); False: API only
+        self.settings = settings or {}
+        self.next_run = 0.0
+        self.running = False
+        self.stats = {'runs': 0, 'skipped': 0, 'failures': 0, 'last_listings': None, 'last_seconds': None}
+
+    @classmethod
+    def from_dict(cls, data, index=0):
+        """Build a job from one jobs-file entry; raises ValueError on bad keys or values"""
+        unknown = set(data) - set(cls.SETTINGS) - {'name', 'interval', 'jitter', 'browser'}
+        if unknown:
+            raise ValueError(f"unknown job keys: {', '.join(sorted(unknown))}")
+        interval = float(data.get('interval', 900))
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        settings = {}
+        for key, (attr, kind) in cls.SETTINGS.items():
+            if key in data:
+                try:
+                    settings[attr] = kind(data[key])
+                except (TypeError, ValueError) as e:
+                    raise ValueError(f"{key}: {e}") from e
+        try:
+            browser = json_bool(data.get('browser', False))
+        except ValueError as e:
+            raise ValueError(f"browser: {e}") from e
+        return cls(str(data.get('name') or f"job{index + 1}"), interval,
+                   jitter=max(0.0, float(data.get('jitter', 0))), browser=browser,
+                   settings=settings)
+
+    def schedule(self, now, first=False):
+        """Set the next run one interval from now (the first run is due immediately), plus random jitter"""
+        self.next_run = now + (0.0 if first else self.interval) + random.uniform(0, self.jitter)
+
+
+def load_daemon_jobs(path):
+    """Read DaemonJobs from a JSON file: a list of jobs or {"jobs": [...]}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    entries = data.get('jobs') if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("expected a non-empty list of jobs")
+    jobs = [DaemonJob.from_dict(entry, i) for i, entry in enumerate(entries)]
+    names = [job.name for job in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("job names must be unique")
+    return jobs
+
+
+class ScrapeDaemon:
+    """Runs DaemonJobs on their intervals with one warm scraper instead of a process per run.
+
+    Each run works on a spawn_worker() copy, so jobs share the session, user agent, HTML
+    engine, caches, store and browser pool. A job that is still running (or waiting for a
+    worker) when it comes due again is skipped. SIGTERM/SIGINT stop scheduling and let
+    running jobs finish.
+    """
+
+    def __init__(self, scraper, jobs, workers=1):
+        self.scraper = scraper
+        self.jobs = jobs
+        self.workers = max(1, int(workers))
+        self.stop_event = threading.Event()
+
+    def request_stop(self, signum=None, frame=None):
+        if not self.stop_event.is_set():
+            print(f"\n🛑 Stop requested{f' (signal {signum})' if signum else ''}, waiting for running jobs...")
+        self.stop_event.set()
+
+    def install_signal_handlers(self):
+        import signal
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self.request_stop)
+
+    def warm_up(self):
+        """Build the scraper's lazy helpers once so every job copy reuses them"""
+        for attr in ('ua', 'html_engine'):
+            try:
+                getattr(self.scraper, attr)
+            except Exception as e:
+                print(f"⚠️ Could not prepare {attr}: {e}")
+
+    def run_job(self, job):
+        """One run of a job on a scraper copy (called on a worker thread)"""
+        start = time.time()
+        worker = self.scraper.spawn_worker()
+        # --host-budget caps one run, not the daemon's lifetime
+        worker.host_budget = HostRequestBudget(self.scraper.host_budget.max_requests)
+        for attr, value in job.settings.items():
+            setattr(worker, attr, value)
+        print(f"▶️  Job {job.name} started")
+        try:
+            if job.browser:
+                listings = worker.run_enhanced_scraper()
+            else:
+                listings = worker.fetch_configured_api_listings()
+                listings = worker.enhance_listings(worker.remove_duplicates(listings or []))
+                worker.save_results(listings, filename_prefix=f"olx_{job.name}")
+            job.stats['last_listings'] = len(listings or [])
+            # An empty result from a complete crawl is a valid answer for a narrow search; only an
+            # empty result from a crawl that failed or stopped early counts as a failed run
+            if not listings and worker.api_crawl_complete is False:
+                raise RuntimeError("no listings fetched (API crawl incomplete)")
+            print(f"✅ Job {job.name}: {job.stats['last_listings']} listings in {time.time() - start:.1f}s "
+                  f"(next run in {max(0.0, job.next_run - time.time()):.0f}s)")
+        except Exception as e:
+            job.stats['failures'] += 1
+            print(f"❌ Job {job.name} failed: {e}")
+        finally:
+            job.stats['runs'] += 1
+            job.stats['last_seconds'] = round(time.time() - start, 3)
+            job.running = False
+
+    def run(self):
+        """Schedule jobs until stopped; returns the per-job stats"""
+        self.install_signal_handlers()
+        self.warm_up()
+        now = time.time()
+        for job in self.jobs:
+            job.schedule(now, first=True)
+        print(f"🕰️  Daemon started: {len(self.jobs)} jobs, {self.workers} worker(s); SIGTERM or Ctrl+C to stop")
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='olx-job')
+        try:
+            while not self.stop_event.is_set():
+                now = time.time()
+                for job in self.jobs:
+                    if job.next_run > now:
+                        continue
+                    if job.running:
+                        job.stats['skipped'] += 1
+                        print(f"⏭️  Job {job.name} is still running, skipping this run")
+                    else:
+                        job.running = True
+                        pool.submit(self.run_job, job)
+                    job.schedule(now)
+                self.stop_event.wait(max(0.0, min(job.next_run for job in self.jobs) - time.time()))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        print("🕰️  Daemon stopped")
+        for job in self.jobs:
+            s = job.stats
+            print(f"   {job.name}: runs={s['runs']} skipped={s['skipped']} failures={s['failures']}")
+        return {job.name: dict(job.stats) for job in self.jobs}
 
-# Try to import webdriver manager (fallback option)
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.service import Service
-    from webdriver_manager.chrome import ChromeDriverManager
-    WEBDRIVER_MANAGER_AVAILABLE = True
-except ImportError:
-    WEBDRIVER_MANAGER_AVAILABLE = False
-    print("⚠️ webdriver-manager not available. Install with: pip install webdriver-manager")
 
 class ImprovedOLXScraper:
+    # Page-source markers of bot-protection interstitials
+    # Phrases matched against the page title and the start of the visible text (specific to
+    # interstitials: generic words like 'loading' appear on ordinary results pages)
+    PROTECTION_INDICATORS = [
+        'just a moment', 'checking your browser', 'verify you are human', 'verifying you are human',
+        'ddos-guard', 'attention required', 'bot protection', 'security check',
+    ]
+
     def __init__(self, headless=False):
         self.base_url = "https://www.olx.in"
         # Try alternative URLs if main one fails
@@ -41,21 +2125,110 @@ class ImprovedOLXScraper:
         self.headless = headless
         self.driver = None
         self.wait = None
-        self.ua = UserAgent()
-        self.session = requests.Session()
+        self._ua = None  # fake_useragent.UserAgent, created on first use
+        # No transport-level retries: API requests are retried by APIFlowControl (send_api_request)
+        self.session = HTTPTransport(retries=0, user_agent=self.session_user_agent)
         # API parameters (overridable via CLI)
         self.api_query = "car cover"
         self.api_size = 80
         self.api_location = 1000001
         self.api_only = False
+        # Response size/parsing: facets are never used, so a small facet_limit shrinks every page
+        self.api_facet_limit = 1000
+        self.json_parser = 'auto'  # auto, stream (ijson), whole (orjson if installed) or json
+        # Whether the last API crawl reached the final page with no failed pages; the store and
+        # delta only mark unseen ads as removed after a complete crawl
+        self.api_crawl_complete = None
+        # API-first listings written before a Selenium pass; committed to the store and delta
+        # together with the final results so each invocation closes one store/delta run
+        self.api_first_listings = []
+        # Pagination controls (walk every relevance API page with a bounded worker pool)
+        self.api_paginate = False
+        self.api_max_pages = 50
+        self.api_concurrency = 4
+        self.host_budget = HostRequestBudget()
+        # Multi-query / multi-location fan-out (see AsyncFanoutEngine)
+        self.fanout_queries = []
+        self.fanout_locations = []
+        # Rate limit, adaptive concurrency and retries shared by every API request (see APIFlowControl)
+        self.api_flow = APIFlowControl(max_concurrency=self.api_concurrency)
+        # Optional relevance API response cache (see ResponseCache)
+        self.response_cache = None
+        # Optional persistent listing store (see ListingStore)
+        self.listing_store = None
+        # Output location and streaming (JSON Lines/CSV written record by record)
+        self.results_dir = "olx_scraping_results"
+        self.stream_output = False
+        self.stream_compression = None  # None, 'gzip' or 'zstd'
+        self.parquet_dir = None  # when set, also write a date-partitioned Parquet dataset here
+        self.delta_index = None  # DeltaIndex: also write a _delta.json of new/changed/removed API listings
+        self.write_snapshot = True  # False: skip the full JSON/CSV/report snapshot (delta-only runs)
         # Output behavior controls
         self.no_filter = False  # when True, bypass car-cover filtering to mirror UI results
         self.sort_by = 'quality'  # one of: quality, date, price, relevance (relevance falls back to quality)
         self.featured_first = False
+        self.classifier = CarCoverClassifier()
+        # Dedup: id -> URL -> fingerprint, plus optional MinHash near-duplicate detection
+        self.near_duplicates = False
+        self.near_dup_threshold = 0.8
+        self.top_n = None  # write only the best N listings (listings arrive sorted); store/delta see all
+        self.profiler = None  # RunProfiler when --profile is on
+        # Offline HTML extraction (see HTMLExtractionEngine); 'auto' picks the fastest installed parser
+        self.html_backend = 'auto'
+        self._html_engine = None
+        # Selenium card extraction: one execute_script call per page instead of per-element lookups
+        self.bulk_dom = True
+        # Selenium waits are condition-based and capped per stage; fast mode skips scroll choreography
+        self.stage_budgets = dict(DEFAULT_STAGE_BUDGETS)
+        self.fast_mode = False
+        self.stage_timings = []
+        # Optional BrowserPool shared across runs; without one each run launches and quits its own browser
+        self.browser_pool = None
+        # Parallel Selenium crawl: N browser workers over search URLs x result pages, optional early stop
+        self.browser_workers = 1
+        self.selenium_pages = 1
+        self.target_count = None
+        # Resource blocking for Selenium loads: BLOCKED_RESOURCE_PATTERNS categories plus extra URL patterns
+        self.blocked_resources = []
+        self.blocked_url_patterns = []
+        self.page_weights = []
+
+    @property
+    def ua(self):
+        """Random user-agent generator (fake_useragent is imported on first access)"""
+        if self._ua is None:
+            from fake_useragent import UserAgent
+            self._ua = UserAgent()
+        return self._ua
         
-    def setup_driver(self):
-        """Setup Chrome driver with compatible configurations"""
+    def session_user_agent(self):
+        """User-Agent sent on every HTTP request of this session (picked once, on first use)"""
         try:
+            return self.ua.random
+        except Exception:
+            return 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36'
+
+    def configure_transport(self, pool_size=None, http2=False):
+        """Replace the HTTP session; the pool is sized to at least the API concurrency"""
+        pool_size = max(int(pool_size or 20), self.api_concurrency)
+        old = self.session
+        self.session = HTTPTransport(pool_size=pool_size, http2=http2, retries=0, user_agent=self.session_user_agent)
+        if hasattr(old, 'close'):
+            old.close()
+        return self.session
+
+    def attach_driver(self, driver):
+        """Use an already-launched browser for the Selenium strategies"""
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        self.driver = driver
+        self.wait = WebDriverWait(driver, 20) if driver is not None else None
+    
+    def create_driver(self):
+        """Launch a configured Chrome session (None on failure)"""
+        try:
+            import undetected_chromedriver as uc
+
             options = uc.ChromeOptions()
             
             # Basic essential options only
@@ -86,21 +2259,22 @@ class ImprovedOLXScraper:
             try:
                 options.add_experimental_option("excludeSwitches", ["enable-automation"])
                 options.add_experimental_option('useAutomationExtension', False)
+                if self.blocked_content_prefs():
+                    options.add_experimental_option('prefs', self.blocked_content_prefs())
             except Exception as exp_error:
                 print(f"⚠️ Experimental options skipped: {exp_error}")
             
             # Create driver with error handling
             try:
-                self.driver = uc.Chrome(options=options, version_main=None)
+                driver = uc.Chrome(options=options, version_main=None)
                 print("✅ Driver created with undetected-chromedriver")
             except Exception as uc_error:
                 print(f"⚠️ Undetected ChromeDriver failed: {uc_error}")
                 print("🔄 Trying regular ChromeDriver...")
                 
                 # Fallback to regular ChromeDriver only if webdriver manager is available
-                if not WEBDRIVER_MANAGER_AVAILABLE:
-                    print("❌ webdriver-manager not available for fallback")
-                    return False
+                from selenium import webdriver
+                from selenium.webdriver.chrome.service import Service
                 
                 # Simple options for regular driver
                 simple_options = webdriver.ChromeOptions()
@@ -110,28 +2284,33 @@ class ImprovedOLXScraper:
                 
                 if self.headless:
                     simple_options.add_argument('--headless')
+                if self.blocked_content_prefs():
+                    simple_options.add_experimental_option('prefs', self.blocked_content_prefs())
                 
                 try:
-                    service = Service(ChromeDriverManager().install())
-                    self.driver = webdriver.Chrome(service=service, options=simple_options)
+                    service = Service(cached_chromedriver_path())
+                    driver = webdriver.Chrome(service=service, options=simple_options)
                     print("✅ Regular ChromeDriver setup successful")
+                except ImportError:
+                    print("❌ webdriver-manager not available for fallback. Install with: pip install webdriver-manager")
+                    return None
                 except Exception as regular_error:
                     print(f"❌ Regular ChromeDriver also failed: {regular_error}")
-                    return False
+                    return None
             
             # Execute anti-detection script if possible
             try:
-                self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+                driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             except:
                 pass
             
-            self.driver.implicitly_wait(10)
-            self.wait = WebDriverWait(self.driver, 20)
+            driver.implicitly_wait(10)
+            self.apply_resource_blocking(driver)
             
             print("✅ Chrome driver setup successful")
             print(f"   📐 Window Size: {selected_size}")
             
-            return True
+            return driver
             
         except Exception as e:
             print(f"❌ Driver setup failed: {e}")
@@ -139,19 +2318,77 @@ class ImprovedOLXScraper:
             print("   • Install/update Chrome browser")
             print("   • Install webdriver-manager: pip install webdriver-manager")
             print("   • Check if Chrome is in PATH")
+            return None
+    
+    def blocked_url_list(self):
+        """Network.setBlockedURLs patterns for the configured categories and extra patterns"""
+        patterns = []
+        for category in self.blocked_resources:
+            patterns.extend(BLOCKED_RESOURCE_PATTERNS.get(category, []))
+        patterns.extend(self.blocked_url_patterns)
+        return list(dict.fromkeys(patterns))
+    
+    def blocked_content_prefs(self):
+        """Chrome content-setting prefs for blocked categories (images are also blocked at the renderer)"""
+        if 'images' in self.blocked_resources:
+            return {'profile.managed_default_content_settings.images': 2}
+        return {}
+    
+    def apply_resource_blocking(self, driver):
+        """Install the block list on a new browser via CDP"""
+        patterns = self.blocked_url_list()
+        if not patterns:
+            return False
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            print(f"   🚫 Blocking {len(patterns)} URL patterns ({', '.join(self.blocked_resources) or 'custom'})")
+            return True
+        except Exception as e:
+            print(f"   ⚠️ Resource blocking unavailable: {e}")
             return False
     
+    def record_page_weight(self, url):
+        """Log bytes transferred, requests and load time of the current page"""
+        try:
+            transferred, requests_made, zero_size, load_ms = self.driver.execute_script(PAGE_WEIGHT_JS)
+        except Exception:
+            return None
+        entry = {
+            'url': url,
+            'bytes': int(transferred or 0),
+            'requests': int(requests_made or 0),
+            'zero_size_entries': int(zero_size or 0),
+            'load_ms': int(load_ms or 0),
+            'blocking': bool(self.blocked_url_list()),
+        }
+        self.page_weights.append(entry)
+        if self.profiler:
+            self.profiler.count('browser_pages')
+            self.profiler.count('browser_bytes_downloaded', entry['bytes'])
+        print(f"   📦 Page weight: {entry['bytes'] / 1024:.0f} KB in {entry['requests']} requests, "
+              f"load {entry['load_ms'] / 1000:.2f}s ({entry['zero_size_entries']} zero-size: cached/opaque/failed)")
+        return entry
+    
+    def report_page_weights(self):
+        """Print average page weight and load time for the run"""
+        if not self.page_weights:
+            return
+        count = len(self.page_weights)
+        avg_kb = sum(e['bytes'] for e in self.page_weights) / count / 1024
+        avg_load = sum(e['load_ms'] for e in self.page_weights) / count / 1000
+        zero_size = sum(e['zero_size_entries'] for e in self.page_weights)
+        mode = 'blocking on' if self.page_weights[0]['blocking'] else 'blocking off'
+        print(f"📦 Pages: {count} | avg {avg_kb:.0f} KB, avg load {avg_load:.2f}s | {zero_size} zero-size entries ({mode})")
+    
+    @profiled()
     def try_requests_fallback(self, url):
         """Try to get data using requests as fallback"""
         try:
             print("🔄 Trying requests fallback...")
             
             headers = {
-                'User-Agent': self.ua.random,
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
                 'Upgrade-Insecure-Requests': '1',
             }
             
@@ -171,60 +2408,54 @@ class ImprovedOLXScraper:
     
     def advanced_protection_bypass(self):
         """Advanced protection bypass with multiple strategies"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.action_chains import ActionChains
+        from selenium.webdriver.common.keys import Keys
+
         try:
             print("🛡️ Attempting advanced protection bypass...")
             
-            # Wait for initial page load
-            time.sleep(random.uniform(5, 8))
+            # Wait for initial page load (returns as soon as the document is complete)
+            self.wait_for(lambda: self.probe_page()['ready'], self.stage_budgets['load'])
             
-            current_url = self.driver.current_url
-            page_source = self.driver.page_source.lower()
-            
-            # Check for various protection systems
-            protection_indicators = [
-                'cloudflare', 'checking your browser', 'ddos-guard', 
-                'captcha', 'bot protection', 'security check',
-                'please wait', 'loading', 'verifying'
-            ]
-            
-            is_protected = any(indicator in page_source for indicator in protection_indicators)
+            is_protected = self.is_protected_page()
             
             if is_protected:
                 print("🔄 Protection detected, trying bypass strategies...")
+                budget = self.stage_budgets['protection']
                 
                 # Strategy 1: Wait and let it auto-resolve
-                print("   ⏳ Waiting for auto-bypass (30s)...")
-                time.sleep(30)
+                print(f"   ⏳ Waiting for auto-bypass (up to {budget:g}s)...")
+                resolved = self.wait_for(lambda: not self.is_protected_page(), budget, poll=1.0)
                 
                 # Strategy 2: Try human-like interactions
-                try:
-                    print("   🖱️ Simulating human interactions...")
-                    body = self.driver.find_element(By.TAG_NAME, "body")
-                    
-                    # Move mouse and click randomly
-                    ActionChains(self.driver).move_to_element(body).perform()
-                    time.sleep(2)
-                    ActionChains(self.driver).click().perform()
-                    time.sleep(3)
-                    
-                    # Random key presses
-                    ActionChains(self.driver).send_keys(Keys.TAB).perform()
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    print(f"   ⚠️ Interaction simulation failed: {e}")
+                if not resolved:
+                    try:
+                        print("   🖱️ Simulating human interactions...")
+                        body = self.driver.find_element(By.TAG_NAME, "body")
+                        
+                        # Move mouse and click randomly
+                        ActionChains(self.driver).move_to_element(body).perform()
+                        time.sleep(random.uniform(0.3, 1))
+                        ActionChains(self.driver).click().perform()
+                        time.sleep(random.uniform(0.3, 1))
+                        
+                        # Random key presses
+                        ActionChains(self.driver).send_keys(Keys.TAB).perform()
+                        
+                    except Exception as e:
+                        print(f"   ⚠️ Interaction simulation failed: {e}")
                 
-                # Strategy 3: Refresh and retry
-                if 'cloudflare' in self.driver.page_source.lower():
+                # Strategy 3: Refresh and retry (challenge check via the probe, not page_source)
+                if not resolved and self.is_protected_page():
                     print("   🔄 Refreshing page...")
                     self.driver.refresh()
-                    time.sleep(15)
+                    self.wait_for(lambda: self.probe_page()['ready'] and not self.is_protected_page(), budget, poll=1.0)
                 
                 # Check if bypass was successful
-                new_page_source = self.driver.page_source.lower()
                 new_url = self.driver.current_url
                 
-                still_protected = any(indicator in new_page_source for indicator in protection_indicators)
+                still_protected = self.is_protected_page()
                 
                 if not still_protected and 'olx.in' in new_url:
                     print("   ✅ Protection bypassed successfully!")
@@ -240,8 +2471,91 @@ class ImprovedOLXScraper:
             print(f"❌ Protection bypass error: {e}")
             return False
     
+    def probe_page(self, require_items=False):
+        """Readiness snapshot in one round-trip: document state, listing cards and loaded resources"""
+        try:
+            state, selector, items, resources = self.driver.execute_script(
+                PAGE_PROBE_JS, LISTING_CONTAINER_SELECTORS
+            )
+            probe = {'ready': state == 'complete', 'selector': selector,
+                     'items': int(items or 0), 'resources': int(resources or 0)}
+        except Exception:
+            probe = {'ready': False, 'selector': None, 'items': 0, 'resources': 0}
+        if require_items and probe['items'] <= 1:
+            return None
+        return probe
+    
+    def is_protected_page(self):
+        """Whether the current page looks like a bot-protection interstitial (title, challenge elements)"""
+        return bool(self.driver.execute_script(PROTECTION_PROBE_JS, self.PROTECTION_INDICATORS, PROTECTION_SELECTORS))
+    
+    def wait_for(self, condition, budget, poll=0.25):
+        """Poll condition() until it is truthy or the budget (seconds) runs out; returns its last value"""
+        deadline = time.monotonic() + max(0.0, budget)
+        while True:
+            try:
+                result = condition()
+            except Exception:
+                result = None
+            if result or time.monotonic() >= deadline:
+                return result
+            time.sleep(poll)
+    
+    def wait_for_stable_listings(self, budget, settle_polls=2, poll=0.4):
+        """Wait until the listing-card and network resource counts stop changing (or the budget ends)"""
+        deadline = time.monotonic() + max(0.0, budget)
+        last, stable = None, 0
+        probe = self.probe_page()
+        while time.monotonic() < deadline:
+            current = (probe['items'], probe['resources'])
+            if probe['ready'] and current == last:
+                stable += 1
+                if stable >= settle_polls:
+                    break
+            else:
+                stable = 0
+            last = current
+            time.sleep(poll)
+            probe = self.probe_page()
+        return probe
+    
+    @contextmanager
+    def timed_stage(self, stage):
+        """Record how long one Selenium stage took for the current URL"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_timings.append({
+                'url_index': self.current_url_index,
+                'stage': stage,
+                'seconds': round(elapsed, 3),
+            })
+            if self.profiler:
+                self.profiler.record(f"selenium_{stage}", elapsed)
+            budget = self.stage_budgets.get(stage)
+            suffix = f" (budget {budget:g}s)" if budget is not None else ""
+            print(f"   ⏱️ {stage}: {elapsed:.2f}s{suffix}")
+    
+    def report_stage_timings(self):
+        """Print total time spent per Selenium stage"""
+        if not self.stage_timings:
+            return
+        totals = {}
+        for entry in self.stage_timings:
+            totals[entry['stage']] = totals.get(entry['stage'], 0.0) + entry['seconds']
+        print("\n⏱️ Stage timings:")
+        for stage, seconds in totals.items():
+            print(f"   {stage:<12} {seconds:7.2f}s")
+        print(f"   {'total':<12} {sum(totals.values()):7.2f}s")
+    
     def smart_wait_for_content(self):
         """Smart waiting for content to load"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
         try:
             print("⏳ Waiting for content to load...")
             
@@ -253,32 +2567,18 @@ class ImprovedOLXScraper:
                 print("   ⚠️ Basic page structure timeout")
                 return False
             
-            # Wait for potential listing containers
-            potential_selectors = [
-                '[data-aut-id="itemBox"]',
-                '.item', '.listing', '.ad-item',
-                '[class*="item"]', '[class*="listing"]',
-                'article', '.card'
-            ]
+            # Wait for potential listing containers, then for the card count to settle
+            deadline = time.monotonic() + self.stage_budgets['content']
+            probe = self.wait_for(lambda: self.probe_page(require_items=True), self.stage_budgets['content'])
             
-            content_found = False
-            for selector in potential_selectors:
-                try:
-                    elements = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-                    )
-                    if len(elements) > 1:
-                        print(f"   ✅ Found content with selector: {selector}")
-                        content_found = True
-                        break
-                except:
-                    continue
-            
-            if not content_found:
+            if probe:
+                print(f"   ✅ Found content with selector: {probe['selector']}")
+            else:
                 print("   ⚠️ No specific content containers found, but continuing...")
             
-            # Additional wait for dynamic content
-            time.sleep(5)
+            # Dynamic content: stop as soon as cards and network requests stop changing
+            settled = self.wait_for_stable_listings(deadline - time.monotonic())
+            print(f"   ✅ Content settled at {settled['items']} cards")
             return True
             
         except Exception as e:
@@ -287,9 +2587,18 @@ class ImprovedOLXScraper:
     
     def enhanced_human_simulation(self):
         """Enhanced human behavior simulation"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.action_chains import ActionChains
+
         try:
             print("🤖 Simulating enhanced human behavior...")
             
+            if self.fast_mode and self.probe_page()['items'] > 2:
+                print("   ⚡ Fast mode: listings already rendered, skipping scroll simulation")
+                return True
+            
+            deadline = time.monotonic() + self.stage_budgets['simulation']
+            
             # Get page dimensions
             total_height = self.driver.execute_script("return document.body.scrollHeight")
             viewport_height = self.driver.execute_script("return window.innerHeight")
@@ -310,6 +2619,9 @@ class ImprovedOLXScraper:
             
             # Execute scrolling
             for pos in scroll_positions:
+                if time.monotonic() >= deadline:
+                    print("   ⏱️ Simulation budget reached, stopping scroll")
+                    break
                 self.driver.execute_script(f"window.scrollTo(0, {pos});")
                 
                 # Realistic pause times
@@ -318,7 +2630,7 @@ class ImprovedOLXScraper:
                 else:
                     pause_time = random.uniform(0.5, 2)
                 
-                time.sleep(pause_time)
+                time.sleep(min(pause_time, max(0.0, deadline - time.monotonic())))
                 
                 # Occasional mouse movements
                 if random.random() < 0.2:  # 20% chance
@@ -331,9 +2643,10 @@ class ImprovedOLXScraper:
             # Scroll back up (realistic behavior)
             middle_pos = total_height // 2
             self.driver.execute_script(f"window.scrollTo(0, {middle_pos});")
-            time.sleep(2)
             self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(3)
+            
+            # Let lazy-loaded cards triggered by scrolling finish rendering
+            self.wait_for_stable_listings(deadline - time.monotonic())
             
             print("   ✅ Enhanced human simulation completed")
             return True
@@ -342,14 +2655,23 @@ class ImprovedOLXScraper:
             print(f"⚠️ Human simulation error: {e}")
             return False
     
-    def comprehensive_extraction(self):
+    @profiled()
+    def comprehensive_extraction(self, use_api=True):
         """Comprehensive data extraction with multiple strategies"""
         print("🔍 Starting comprehensive extraction...")
         
         all_listings = []
         
+        # One page-source capture per URL, shared by the page-source strategies below
+        snapshot = None
+        def page_snapshot():
+            nonlocal snapshot
+            if snapshot is None:
+                snapshot = self.capture_snapshot()
+            return snapshot
+        
         # Strategy 0: Prefer official relevance API (fast, structured)
-        api_listings = self.fetch_via_relevance_api(query=self.api_query, size=self.api_size, location=self.api_location)
+        api_listings = self.fetch_configured_api_listings() if use_api else []
         if api_listings:
             all_listings.extend(api_listings)
             print(f"   ✅ API extraction: {len(api_listings)} items")
@@ -370,14 +2692,14 @@ class ImprovedOLXScraper:
         
         # Strategy 3: BeautifulSoup parsing (fallback)
         if len(all_listings) < 10:
-            bs_listings = self.extract_with_beautifulsoup()
+            bs_listings = self.extract_with_beautifulsoup(page_snapshot())
             if bs_listings:
                 all_listings.extend(bs_listings)
                 print(f"   ✅ BeautifulSoup extraction: {len(bs_listings)} items")
         
         # Strategy 4: Text pattern matching (last resort)
         if len(all_listings) < 5:
-            pattern_listings = self.extract_with_patterns()
+            pattern_listings = self.extract_with_patterns(page_snapshot())
             if pattern_listings:
                 all_listings.extend(pattern_listings)
                 print(f"   ✅ Pattern extraction: {len(pattern_listings)} items")
@@ -403,12 +2725,18 @@ class ImprovedOLXScraper:
             print(f"✅ Total unique listings extracted: {len(unique_listings)}")
         else:
             print("⚠️ No listings extracted - creating diagnostic info...")
-            unique_listings = self.create_diagnostic_info()
+            unique_listings = self.create_diagnostic_info(page_snapshot())
         
         return unique_listings
+
+    def capture_snapshot(self):
+        """Capture the current page once as an immutable PageSnapshot"""
+        return PageSnapshot.from_driver(self.driver)
     
     def extract_modern_listings(self):
         """Extract using modern OLX selectors"""
+        from selenium.webdriver.common.by import By
+
         listings = []
         
         modern_selectors = [
@@ -420,6 +2748,11 @@ class ImprovedOLXScraper:
             '[class*="ItemCard"]'
         ]
         
+        if self.bulk_dom:
+            bulk = self.extract_cards_bulk(modern_selectors, 2, 20, "modern")
+            if bulk is not None:
+                return [listing for listing in bulk if listing.get('title')]
+        
         for selector in modern_selectors:
             try:
                 elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
@@ -436,6 +2769,8 @@ class ImprovedOLXScraper:
     
     def extract_generic_listings(self):
         """Extract using generic selectors"""
+        from selenium.webdriver.common.by import By
+
         listings = []
         
         generic_selectors = [
@@ -444,6 +2779,11 @@ class ImprovedOLXScraper:
             'div[class*="listing"]', 'li[class*="item"]'
         ]
         
+        if self.bulk_dom:
+            bulk = self.extract_cards_bulk(generic_selectors, 3, 15, "generic")
+            if bulk is not None:
+                return [listing for listing in bulk if listing.get('title') and len(listing['title']) > 10]
+        
         for selector in generic_selectors:
             try:
                 elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
@@ -458,110 +2798,124 @@ class ImprovedOLXScraper:
         
         return listings
     
+    def extract_cards_bulk(self, selectors, min_count, limit, prefix):
+        """Extract listing cards with a single execute_script round-trip (None when unavailable)"""
+        try:
+            result = self.driver.execute_script(
+                BULK_DOM_EXTRACT_JS, selectors, min_count, limit, CARD_FIELD_SELECTORS
+            )
+        except Exception as e:
+            print(f"   ⚠️ Bulk DOM extraction failed ({str(e)[:80]}); using per-element parsing")
+            return None
+        if not result:
+            return []
+        listings = []
+        for i, fields in enumerate(result.get('cards') or []):
+            listing = self.listing_from_element_fields(fields, f"{prefix}_{i+1}")
+            if listing:
+                listings.append(listing)
+        return listings
+    
     def parse_listing_element(self, element, item_id):
         """Parse individual listing element"""
+        from selenium.webdriver.common.by import By
+
+        def first_match(selectors, read):
+            # Lazily query one selector at a time so accepted fields stop further round-trips
+            for selector in selectors:
+                try:
+                    yield read(element.find_element(By.CSS_SELECTOR, selector))
+                except Exception:
+                    yield None
+
+        def read_title(elem):
+            return (elem.get_attribute('title') or
+                    elem.text or
+                    elem.get_attribute('alt'))
+
+        fields = {
+            'titles': first_match(CARD_FIELD_SELECTORS['title'], read_title),
+            'prices': first_match(CARD_FIELD_SELECTORS['price'], lambda elem: elem.text),
+            'locations': first_match(CARD_FIELD_SELECTORS['location'], lambda elem: elem.text),
+        }
         try:
-            listing = {
-                'id': item_id,
-                'title': '',
-                'price': '',
-                'location': '',
-                'url': '',
-                'image_url': '',
-                'date_posted': '',
-                'description': '',
-                'scraped_at': time.strftime("%Y-%m-%d %H:%M:%S"),
-                'source': 'selenium'
-            }
+            fields['href'] = element.find_element(By.CSS_SELECTOR, 'a[href]').get_attribute('href')
+        except:
+            pass
+        try:
+            img_elem = element.find_element(By.CSS_SELECTOR, 'img')
+            fields['image'] = (img_elem.get_attribute('src') or 
+                               img_elem.get_attribute('data-src') or
+                               img_elem.get_attribute('data-lazy-src'))
+        except:
+            pass
+        try:
+            fields['text'] = element.text
+        except:
+            pass
+        return self.listing_from_element_fields(fields, item_id)
+    
+    def listing_from_element_fields(self, fields, item_id):
+        """Normalize raw card fields (per-element or bulk DOM) into a filtered Listing"""
+        try:
+            listing = Listing(
+                id=item_id,
+                title='',
+                price='',
+                location='',
+                url='',
+                image_url='',
+                date_posted='',
+                description='',
+                scraped_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+                source='selenium'
+            )
             
             # Extract title
-            title_selectors = [
-                '[data-aut-id="itemTitle"]', 'h1', 'h2', 'h3', 'h4',
-                '.title', '[class*="title"]', '[class*="Title"]',
-                'a[title]', 'span[title]'
-            ]
-            
-            for ts in title_selectors:
-                try:
-                    title_elem = element.find_element(By.CSS_SELECTOR, ts)
-                    title_text = (title_elem.get_attribute('title') or 
-                                 title_elem.text or 
-                                 title_elem.get_attribute('alt')).strip()
-                    if title_text and len(title_text) > 8:
-                        listing['title'] = title_text[:200]  # Limit length
-                        break
-                except:
-                    continue
+            for title_text in fields.get('titles') or []:
+                title_text = (title_text or '').strip()
+                if title_text and len(title_text) > 8:
+                    listing['title'] = title_text[:200]  # Limit length
+                    break
             
             # Extract price
-            price_selectors = [
-                '[data-aut-id="itemPrice"]', '.price', '[class*="price"]',
-                '[class*="Price"]', '.amount', '.cost'
-            ]
-            
-            for ps in price_selectors:
-                try:
-                    price_elem = element.find_element(By.CSS_SELECTOR, ps)
-                    price_text = price_elem.text.strip()
-                    if price_text and ('₹' in price_text or 'Rs' in price_text or 
-                                     price_text.replace(',', '').replace('.', '').isdigit()):
-                        price_num, price_fmt = self.parse_price_fields(price_text)
-                        listing['price'] = price_text[:50]
-                        if price_num:
-                            listing['price_numeric'] = price_num
-                        if price_fmt:
-                            listing['price_formatted'] = price_fmt
-                        break
-                except:
-                    continue
+            for price_text in fields.get('prices') or []:
+                price_text = (price_text or '').strip()
+                if price_text and ('₹' in price_text or 'Rs' in price_text or 
+                                 price_text.replace(',', '').replace('.', '').isdigit()):
+                    price_num, price_fmt = self.parse_price_fields(price_text)
+                    listing['price'] = price_text[:50]
+                    if price_num:
+                        listing['price_numeric'] = price_num
+                    if price_fmt:
+                        listing['price_formatted'] = price_fmt
+                    break
             
             # Extract location
-            location_selectors = [
-                '[data-aut-id="itemLocation"]', '.location', '[class*="location"]',
-                '[class*="Location"]', '.place', '.city'
-            ]
-            
-            for ls in location_selectors:
-                try:
-                    location_elem = element.find_element(By.CSS_SELECTOR, ls)
-                    location_text = location_elem.text.strip()
-                    if location_text and len(location_text) > 2 and len(location_text) < 100:
-                        listing['location'] = location_text
-                        break
-                except:
-                    continue
+            for location_text in fields.get('locations') or []:
+                location_text = (location_text or '').strip()
+                if location_text and len(location_text) > 2 and len(location_text) < 100:
+                    listing['location'] = location_text
+                    break
             
             # Extract URL
-            try:
-                link_elem = element.find_element(By.CSS_SELECTOR, 'a[href]')
-                href = link_elem.get_attribute('href')
-                if href:
-                    if href.startswith('http'):
-                        listing['url'] = href
-                    elif href.startswith('/'):
-                        listing['url'] = urljoin(self.base_url, href)
-            except:
-                pass
+            href = fields.get('href')
+            if href:
+                if href.startswith('http'):
+                    listing['url'] = href
+                elif href.startswith('/'):
+                    listing['url'] = urljoin(self.base_url, href)
             
             # Extract image
-            try:
-                img_elem = element.find_element(By.CSS_SELECTOR, 'img')
-                src = (img_elem.get_attribute('src') or 
-                      img_elem.get_attribute('data-src') or
-                      img_elem.get_attribute('data-lazy-src'))
-                if src and src.startswith('http'):
-                    listing['image_url'] = src
-            except:
-                pass
+            src = fields.get('image')
+            if src and src.startswith('http'):
+                listing['image_url'] = src
             
             # Extract description from alt text or additional text
-            try:
-                all_text = element.text.strip()
-                if all_text and len(all_text) > len(listing.get('title', '')):
-                    # Take first 300 chars as description
-                    listing['description'] = all_text[:300]
-            except:
-                pass
+            all_text = (fields.get('text') or '').strip()
+            if all_text and len(all_text) > len(listing.get('title', '')):
+                # Take first 300 chars as description
+                listing['description'] = all_text[:300]
             
             # Only return listing if it has meaningful content
             if listing['title'] or (listing['price'] and listing['description']):
@@ -572,17 +2926,22 @@ class ImprovedOLXScraper:
         except Exception as e:
             return None
     
-    def extract_with_beautifulsoup(self):
+    def extract_with_beautifulsoup(self, snapshot=None):
         """Enhanced BeautifulSoup extraction"""
         try:
             print("   🔄 BeautifulSoup parsing...")
-            page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            listings = []
+            snapshot = snapshot or self.capture_snapshot()
             
             # Save page source for debugging
             with open('debug_page_source.html', 'w', encoding='utf-8') as f:
-                f.write(page_source)
+                f.write(snapshot.html)
+            
+            # Structured listing cards first (single parse, single traversal)
+            listings = self.extract_listings_from_html(snapshot)
+            if listings:
+                return listings
+            
+            soup = snapshot.soup
             
             # Look for elements containing car cover related text
             car_cover_patterns = [
@@ -601,7 +2960,7 @@ class ImprovedOLXScraper:
                         if parent and parent.name in ['div', 'article', 'li', 'section']:
                             listing_text = parent.get_text().strip()
                             if len(listing_text) > 50:  # Meaningful content
-                                listing = self.parse_text_content(listing_text, len(listings) + 1)
+                                listing = self.parse_text_content(listing_text, len(listings) + 1, url=snapshot.url)
                                 if listing:
                                     listings.append(listing)
                                 break
@@ -615,11 +2974,11 @@ class ImprovedOLXScraper:
             print(f"   ❌ BeautifulSoup error: {e}")
             return []
     
-    def extract_with_patterns(self):
+    def extract_with_patterns(self, snapshot=None):
         """Extract using regex patterns"""
         try:
             print("   🔄 Pattern matching...")
-            page_source = self.driver.page_source
+            snapshot = snapshot or self.capture_snapshot()
             listings = []
             
             # Enhanced patterns for car covers with price
@@ -631,14 +2990,13 @@ class ImprovedOLXScraper:
             ]
             
             for i, pattern in enumerate(patterns):
-                matches = re.finditer(pattern, page_source)
-                for j, match in enumerate(list(matches)[:5]):  # Max 5 per pattern
-                    matched_text = match.group(1)
+                matches = snapshot.findall(pattern)
+                for j, matched_text in enumerate(matches[:5]):  # Max 5 per pattern
                     cleaned_text = re.sub(r'<[^>]+>', '', matched_text)
                     cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
                     
                     if len(cleaned_text) > 30:
-                        listing = self.parse_text_content(cleaned_text, f"pattern_{i}_{j}")
+                        listing = self.parse_text_content(cleaned_text, f"pattern_{i}_{j}", url=snapshot.url)
                         if listing:
                             listings.append(listing)
             
@@ -648,7 +3006,7 @@ class ImprovedOLXScraper:
             print(f"   ❌ Pattern extraction error: {e}")
             return []
     
-    def parse_text_content(self, text_content, item_id):
+    def parse_text_content(self, text_content, item_id, url=None):
         """Parse text content to extract listing info"""
         try:
             # Extract price (strict pattern to avoid trailing digits like "₹ 7,5001")
@@ -669,16 +3027,16 @@ class ImprovedOLXScraper:
                 title = lines[0][:100]  # Fallback to first line
             
             # Create listing
-            listing = {
-                'id': f'text_{item_id}',
-                'title': title,
-                'price': price,
-                'location': 'Location in description',
-                'url': self.driver.current_url,
-                'description': text_content[:400],
-                'scraped_at': time.strftime("%Y-%m-%d %H:%M:%S"),
-                'source': 'text_parsing'
-            }
+            listing = Listing(
+                id=f'text_{item_id}',
+                title=title,
+                price=price,
+                location='Location in description',
+                url=url or self.driver.current_url,
+                description=text_content[:400],
+                scraped_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+                source='text_parsing'
+            )
             # Add parsed numeric price
             if price:
                 num, fmt = self.parse_price_fields(price)
@@ -705,35 +3063,10 @@ class ImprovedOLXScraper:
         except Exception:
             return (None, None)
 
+    @profiled()
     def filter_to_car_cover(self, listing):
         """Filter only true car body cover listings; exclude property/parking results."""
-        text = ' '.join([
-            str(listing.get('title') or ''),
-            str(listing.get('description') or ''),
-            str(listing.get('category') or '')
-        ]).lower()
-
-        # Positive phrases that indicate actual car body covers (avoid 'covered')
-        include_patterns = [
-            r'\bcar\s*cover\b',
-            r'\bbody\s*cover\b',
-            r'\bcar\s*body\s*cover\b',
-            r'\bwaterproof\s*car\s*cover\b',
-            r'\bcar\s*sheet\s*cover\b',
-        ]
-        if not any(re.search(p, text, flags=re.I) for p in include_patterns):
-            return False
-
-        # Hard excludes to remove real-estate and irrelevant matches
-        exclude_patterns = [
-            r'\bbhk\b', r'\bsq\.?ft\b', r'\bapartment\b', r'\bflat\b', r'\bhouse\b',
-            r'\boffice\b', r'\brent\b', r'\bsale\b', r'\bparking\b', r'\bcovered\b',
-            r'\bgaj\b', r'\bshop\b', r'\bcommercial\b', r'\bworkspace\b', r'\bplot\b',
-        ]
-        if any(re.search(p, text, flags=re.I) for p in exclude_patterns):
-            return False
-
-        return True
+        return self.classifier.matches(listing)
 
     def slugify_title(self, title: str) -> str:
         """Create a URL-friendly slug from a title for building fallback OLX item URLs."""
@@ -746,6 +3079,7 @@ class ImprovedOLXScraper:
         except Exception:
             return 'car-cover'
 
+    @profiled()
     def normalize_api_listing(self, item):
         """Map OLX API item to our listing schema with robust fallbacks"""
         try:
@@ -827,25 +3161,25 @@ class ImprovedOLXScraper:
                         continue
             posted_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(posted_at_ts)) if posted_at_ts else ''
 
-            listing = {
-                'id': id_str,
-                'title': title,
-                'price': price_display or (price_fmt or ''),
-                'price_numeric': price_num,
-                'price_formatted': price_fmt,
-                'location': location,
-                'locality': locality,
-                'city': city,
-                'url': url,
-                'image_url': image_url,
-                'description': (item.get('description') or '')[:400],
-                'category': (item.get('category') or {}).get('name') if isinstance(item.get('category'), dict) else (item.get('category_name') or ''),
-                'featured': featured,
-                'posted_at': posted_at,
-                'posted_at_ts': posted_at_ts,
-                'scraped_at': time.strftime("%Y-%m-%d %H:%M:%S"),
-                'source': 'olx_api'
-            }
+            listing = Listing(
+                id=id_str,
+                title=title,
+                price=price_display or (price_fmt or ''),
+                price_numeric=price_num,
+                price_formatted=price_fmt,
+                location=location,
+                locality=locality,
+                city=city,
+                url=url,
+                image_url=image_url,
+                description=(item.get('description') or '')[:400],
+                category=(item.get('category') or {}).get('name') if isinstance(item.get('category'), dict) else (item.get('category_name') or ''),
+                featured=featured,
+                posted_at=posted_at,
+                posted_at_ts=posted_at_ts,
+                scraped_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+                source='olx_api'
+            )
 
             if self.no_filter:
                 return listing
@@ -854,32 +3188,144 @@ class ImprovedOLXScraper:
         except Exception:
             return None
 
+    def build_relevance_api_params(self, query, size, location, page=None):
+        """Query parameters for one relevance v4 search request"""
+        params = {
+            'query': query,
+            'facet_limit': self.api_facet_limit,
+            'location': location,
+            'location_facet_limit': min(40, self.api_facet_limit),
+            'platform': 'web-desktop',
+            'pttenabled': 'true',
+            'relaxedfilters': 'true',
+            'size': size,
+            'spellcheck': 'true',
+        }
+        if page is not None:
+            params['page'] = page
+        return params
+
+    @profiled(count_out=page_item_count)
+    def fetch_relevance_page(self, query="car cover", size=80, location=1000001, page=None):
+        """Fetch one raw page from the relevance API; returns (items, metadata) or None on failure"""
+        url = urljoin(self.base_url, '/api/relevance/v4/search')
+        params = self.build_relevance_api_params(query, size, location, page)
+        cache = self.response_cache
+        cache_key, cached = None, None
+        if cache:
+            cache_key = cache.make_key(url, params)
+            cached, fresh = cache.lookup(cache_key)
+            if cached and fresh:
+                cache.record('hits')
+                return self.parse_relevance_body(cached['body'])
+        if not self.host_budget.acquire(url):
+            print(f"   ⚠️ Request budget exhausted for {urlparse(url).netloc}" + (f", skipping page {page}" if page is not None else ""))
+            return None
+        # User-Agent, Accept-Language and Accept-Encoding are set once on the session (HTTPTransport)
+        headers = {
+            'Accept': 'application/json, text/plain, */*',
+            'Referer': self.base_url,
+        }
+        # Revalidate a stale cache entry instead of re-downloading it when the server supports it
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        resp = self.send_api_request(url, params, headers, page)
+        if resp is None:
+            return None
+        if resp.status_code == 304 and cached:
+            cache.refresh(cache_key)
+            cache.record('revalidated')
+            return self.parse_relevance_body(cached['body'])
+        if resp.status_code != 200:
+            print(f"   ⚠️ API HTTP {resp.status_code}" + (f" (page {page})" if page is not None else ""))
+            return None
+        if cache:
+            cache.record('misses')
+            cache.store(cache_key, resp.content, resp.headers.get('ETag'), resp.headers.get('Last-Modified'))
+        return self.parse_relevance_body(resp.content)
+
+    def send_api_request(self, url, params, headers, page=None):
+        """GET through self.api_flow (rate limit, adaptive concurrency, retries); None if it never got a response"""
+        flow = self.api_flow
+        label = f" (page {page})" if page is not None else ""
+        attempt = 0
+        while True:
+            flow.acquire()
+            try:
+                resp = self.session.get(url, params=params, headers=headers, timeout=30)
+            except Exception as e:
+                flow.release('network_errors')
+                resp, error = None, e
+            else:
+                status = resp.status_code
+                flow.release('ok' if status not in flow.RETRY_STATUSES else
+                             'throttled' if status == 429 else 'server_errors')
+                error = None if status not in flow.RETRY_STATUSES else f"HTTP {status}"
+                if self.profiler:
+                    self.profiler.count('api_requests')
+                    self.profiler.count('api_bytes_downloaded', len(resp.content or b''))
+            if error is None:
+                return resp
+            if attempt >= flow.retries:
+                flow.count('gave_up')
+                print(f"   ❌ API{label} still failing after {attempt} retries: {error}")
+                return resp
+            if not self.host_budget.acquire(url):
+                print(f"   ⚠️ Request budget exhausted for {urlparse(url).netloc}, not retrying{label}")
+                return resp
+            delay = flow.retry_delay(attempt, resp.headers.get('Retry-After') if resp is not None else None)
+            if resp is not None and resp.status_code == 429:
+                flow.pause(delay)
+            flow.count('retried')
+            attempt += 1
+            print(f"   🔁 API{label}: {error}, retry {attempt}/{flow.retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+    @profiled(count_out=page_item_count)
+    def parse_relevance_body(self, body):
+        """Decode a relevance API response body into (items, metadata) with the configured JSON parser"""
+        parser = self.json_parser
+        if parser == 'auto':
+            parser = 'stream' if len(body) >= STREAM_PARSE_MIN_BYTES else 'whole'
+        if parser == 'stream':
+            try:
+                return stream_relevance_body(body)
+            except ImportError:
+                if self.json_parser == 'stream':
+                    print("⚠️ Streaming JSON parser needs `pip install ijson`; parsing whole responses")
+                self.json_parser = 'whole'
+        if parser == 'json':
+            data = json.loads(body)
+            return data.get('data') or data.get('ads') or [], data.get('metadata') or {}
+        return load_relevance_body(body)
+
+    def is_last_relevance_page(self, items, metadata, size, seen_ids):
+        """True when a page is empty/short, carries an end marker, or only repeats ads (updates seen_ids)"""
+        raw_ids = {str(it.get('id') or it.get('ad_id') or '') for it in items}
+        raw_ids.discard('')
+        is_last = (
+            not items or
+            ('next_page_url' in metadata and not metadata.get('next_page_url')) or
+            ('next_page_url' not in metadata and len(items) < size) or
+            bool(raw_ids and raw_ids <= seen_ids)
+        )
+        seen_ids.update(raw_ids)
+        return is_last
+
+    @profiled()
     def fetch_via_relevance_api(self, query="car cover", size=80, location=1000001):
         """Use OLX relevance v4 search API to fetch listings (server-rendered also uses this)."""
         try:
-            params = {
-                'query': query,
-                'facet_limit': 1000,
-                'location': location,
-                'location_facet_limit': 40,
-                'platform': 'web-desktop',
-                'pttenabled': 'true',
-                'relaxedfilters': 'true',
-                'size': size,
-                'spellcheck': 'true',
-            }
-            headers = {
-                'User-Agent': self.ua.random if hasattr(self, 'ua') else 'Mozilla/5.0',
-                'Accept': 'application/json, text/plain, */*',
-                'Referer': self.base_url,
-            }
-            url = urljoin(self.base_url, '/api/relevance/v4/search')
-            resp = self.session.get(url, params=params, headers=headers, timeout=30)
-            if resp.status_code != 200:
-                print(f"   ⚠️ API HTTP {resp.status_code}")
+            self.api_crawl_complete = False
+            page = self.fetch_relevance_page(query=query, size=size, location=location)
+            if page is None:
                 return []
-            data = resp.json()
-            items = data.get('data') or data.get('ads') or []
+            items, metadata = page
+            # One page covers the whole search only when it is also the last page
+            self.api_crawl_complete = self.is_last_relevance_page(items, metadata, size, set())
             results = []
             for it in items:
                 norm = self.normalize_api_listing(it)
@@ -889,78 +3335,249 @@ class ImprovedOLXScraper:
         except Exception as e:
             print(f"   ❌ API extraction error: {e}")
             return []
+
+    def iter_relevance_api_pages(self, query="car cover", size=80, location=1000001, max_pages=None, concurrency=None):
+        """Walk relevance API pages with a bounded worker pool, yielding normalized listings as pages arrive"""
+        max_pages = max_pages or self.api_max_pages
+        concurrency = max(1, int(concurrency or self.api_concurrency))
+        next_page = 0
+        end_page = max_pages  # first page index known to be past the last page
+        pending = {}
+        seen_ids = set()
+        pages_fetched = 0
+        last_page, first_failure = None, None
+        self.api_crawl_complete = False
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='olx-api') as pool:
+            def submit_more():
+                nonlocal next_page
+                while len(pending) < concurrency and next_page < end_page:
+                    future = pool.submit(self.fetch_relevance_page, query, size, location, next_page)
+                    pending[future] = next_page
+                    next_page += 1
+
+            submit_more()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"   ❌ API page {page} error: {e}")
+                        result = None
+                    if result is None or page >= end_page:
+                        if result is None and page < end_page:
+                            first_failure = page if first_failure is None else min(first_failure, page)
+                        end_page = min(end_page, page)
+                        continue
+                    items, metadata = result
+                    pages_fetched += 1
+                    if self.is_last_relevance_page(items, metadata, size, seen_ids):
+                        end_page = min(end_page, page + 1)
+                        last_page = page if last_page is None else min(last_page, page)
+                    for it in items:
+                        norm = self.normalize_api_listing(it)
+                        if norm:
+                            yield norm
+                submit_more()
+
+        # Complete only when the last page was seen and every page before it arrived
+        self.api_crawl_complete = last_page is not None and (first_failure is None or first_failure > last_page)
+        print(f"   📄 Paginated API: {pages_fetched} pages fetched for '{query}' @ {location}"
+              + ("" if self.api_crawl_complete else " (incomplete)"))
+
+    @profiled()
+    def fetch_via_relevance_api_paginated(self, query="car cover", size=80, location=1000001, max_pages=None, concurrency=None):
+        """Collect every page of relevance API results (see iter_relevance_api_pages)"""
+        try:
+            return list(self.iter_relevance_api_pages(query=query, size=size, location=location,
+                                                      max_pages=max_pages, concurrency=concurrency))
+        except Exception as e:
+            print(f"   ❌ Paginated API extraction error: {e}")
+            return []
+
+    def fetch_configured_api_listings(self):
+        """Fetch API listings for the configured query/location, paginating when enabled"""
+        if self.fanout_queries or self.fanout_locations:
+            engine = AsyncFanoutEngine(self, concurrency=self.api_concurrency)
+            return engine.run(self.fanout_queries or [self.api_query],
+                              self.fanout_locations or [self.api_location])
+        if self.api_paginate:
+            return self.fetch_via_relevance_api_paginated(
+                query=self.api_query, size=self.api_size, location=self.api_location,
+                max_pages=self.api_max_pages, concurrency=self.api_concurrency
+            )
+        return self.fetch_via_relevance_api(query=self.api_query, size=self.api_size, location=self.api_location)
     
+    @profiled()
     def remove_duplicates(self, listings):
-        """Remove duplicate listings based on title similarity"""
+        """Remove duplicate listings by ad id, ad URL, content fingerprint (and near-duplicates if enabled)"""
         if not listings:
             return []
         
         unique_listings = []
-        seen_titles = set()
+        dedup = self.new_dedup_index()
         
         for listing in listings:
-            title = listing.get('title', '').lower().strip()
-            if title and title not in seen_titles:
-                seen_titles.add(title)
-                unique_listings.append(listing)
-            elif not title and listing.get('price'):  # Keep listings with price but no title
+            if self.is_new_listing(listing, dedup):
                 unique_listings.append(listing)
         
+        if self.near_duplicates:
+            print(f"   🧹 Dedup: {dedup.summary()}")
         return unique_listings
+
+    def new_dedup_index(self):
+        """Fresh DedupIndex configured from the scraper's near-duplicate settings"""
+        return DedupIndex(near_duplicates=self.near_duplicates, threshold=self.near_dup_threshold)
+
+    def is_new_listing(self, listing, dedup):
+        """Dedup check shared by batch and streaming paths (records the listing's keys in dedup)"""
+        return dedup.add(listing)
     
-    def create_diagnostic_info(self):
+    def create_diagnostic_info(self, snapshot=None):
         """Create diagnostic information when no listings found"""
         try:
-            page_source = self.driver.page_source
-            current_url = self.driver.current_url
+            snapshot = snapshot or self.capture_snapshot()
+            page_source = snapshot.html
+            current_url = snapshot.url
             
             # Analyze page content
-            car_mentions = len(re.findall(r'(?i)car', page_source))
-            cover_mentions = len(re.findall(r'(?i)cover', page_source))
-            price_mentions = len(re.findall(r'₹[\d,]+', page_source))
-            
-            diagnostic = {
-                'id': 'diagnostic_info',
-                'title': 'OLX Scraping Diagnostic Information',
-                'price': f'{price_mentions} price elements found',
-                'location': 'Diagnostic',
-                'url': current_url,
-                'description': f"""
+            car_mentions = snapshot.count(r'(?i)car')
+            cover_mentions = snapshot.count(r'(?i)cover')
+            price_mentions = snapshot.count(r'₹[\d,]+')
+            
+            diagnostic = Listing(
+                id='diagnostic_info',
+                title='OLX Scraping Diagnostic Information',
+                price=f'{price_mentions} price elements found',
+                location='Diagnostic',
+                url=current_url,
+                description=f"""
 Diagnostic Results:
 - Current URL: {current_url}
 - Page length: {len(page_source)} characters
 - 'Car' mentions: {car_mentions}
 - 'Cover' mentions: {cover_mentions}
 - Price mentions: {price_mentions}
-- Page title: {self.driver.title}
+- Page title: {snapshot.title}
 """.strip(),
-                'scraped_at': time.strftime("%Y-%m-%d %H:%M:%S"),
-                'source': 'diagnostic'
-            }
+                scraped_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+                source='diagnostic'
+            )
             
             return [diagnostic]
             
         except Exception as e:
-            return [{
-                'id': 'error_info',
-                'title': 'Scraping Error Occurred',
-                'description': f'Error during diagnostic: {str(e)}',
-                'scraped_at': time.strftime("%Y-%m-%d %H:%M:%S"),
-                'source': 'error'
-            }]
+            return [Listing(
+                id='error_info',
+                title='Scraping Error Occurred',
+                description=f'Error during diagnostic: {str(e)}',
+                scraped_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+                source='error'
+            )]
     
-    def save_results(self, listings, filename_prefix="olx_car_covers_enhanced"):
-        """Enhanced result saving with better formatting"""
+    def api_scope(self):
+        """Identifier of the configured API search, used to scope stored listings"""
+        queries = self.fanout_queries or [self.api_query]
+        locations = self.fanout_locations or [self.api_location]
+        return f"{','.join(queries)}|{','.join(str(loc) for loc in locations)}"
+
+    def track_changes(self, listings, filename_prefix="olx_car_covers_enhanced", timestamp=None):
+        """Close this invocation's store and delta runs over the final listings plus pending API-first ones"""
+        pending, self.api_first_listings = self.api_first_listings, []
+        if pending:
+            final_ids = {l.get('id') for l in listings if l.get('id')}
+            listings = [l for l in pending if l.get('id') not in final_ids] + list(listings)
         if not listings:
-            print("❌ No listings to save")
             return
+        self.store_listings(listings)
+        if self.delta_index is not None:
+            os.makedirs(self.results_dir, exist_ok=True)
+            delta_path = os.path.join(self.results_dir, f"{filename_prefix}_{timestamp or int(time.time())}_delta.json")
+            self.save_delta(listings, delta_path)
+
+    def store_listings(self, listings):
+        """Upsert API listings into the persistent store and report what changed since the last run"""
+        if not self.listing_store:
+            return None
+        api_listings = [l for l in listings if l.get('source') == 'olx_api' and l.get('id')]
+        if not api_listings:
+            return None
+        try:
+            complete = self.api_crawl_complete is not False
+            counts = self.listing_store.upsert_run(api_listings, scope=self.api_scope(), complete=complete)
+            print(f"🗃️  Store: {counts['new']} new, {counts['changed']} changed, "
+                  f"{counts['removed']} removed, {counts['unchanged']} unchanged ({self.listing_store.path})"
+                  + ("" if complete else " (partial crawl: removals not recorded)"))
+            return counts
+        except Exception as e:
+            print(f"Error updating listing store: {e}")
+            return None
+
+    def write_delta(self, delta, path):
+        """Write a delta file and print its counts"""
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(delta, f, indent=2, ensure_ascii=False)
+            counts = delta['delta_metadata']['counts']
+            print(f"🔺 Delta: {counts['new']} new, {counts['price_changed']} price changes, "
+                  f"{counts['updated']} updated, {counts['removed']} removed → {path}")
+        except Exception as e:
+            print(f"Error saving delta: {e}")
+
+    def save_delta(self, listings, path):
+        """Diff API listings against the previous run's index and write the delta file"""
+        if self.delta_index is None:
+            return None
+        api_listings = [l for l in listings if l.get('source') == 'olx_api' and l.get('id')]
+        if not api_listings:
+            return None  # browser-only results have no stable ids to track
+        try:
+            run = self.delta_index.begin_run(self.api_scope())
+            for listing in api_listings:
+                self.delta_index.observe(run, listing)
+            delta = self.delta_index.finish_run(run, complete=self.api_crawl_complete is not False)
+        except Exception as e:
+            print(f"Error updating delta index: {e}")
+            return None
+        self.write_delta(delta, path)
+        return delta
+
+    @profiled(count_out=lambda written: written)
+    def save_results(self, listings, filename_prefix="olx_car_covers_enhanced", track_changes=True):
+        """Enhanced result saving with better formatting; returns the number of listings written.
+
+        track_changes=False writes the files only, leaving the store and delta to a later save.
+        """
+        if not listings:
+            print("❌ No listings to save")
+            if track_changes:
+                self.track_changes([], filename_prefix)
+            return 0
         
         timestamp = int(time.time())
         
         # Create results directory
-        results_dir = "olx_scraping_results"
+        results_dir = self.results_dir
         os.makedirs(results_dir, exist_ok=True)
         
+        # Update the store and save changes since the previous run
+        if track_changes:
+            self.track_changes(listings, filename_prefix, timestamp)
+        
+        # --top limits the written results only; the store and delta above track every listing
+        if self.top_n:
+            listings = listings[:self.top_n]
+        
+        # Save as Parquet (typed, date-partitioned dataset)
+        if self.parquet_dir:
+            self.save_parquet(listings, file_prefix=f"{filename_prefix}_{timestamp}")
+        
+        if not self.write_snapshot:
+            print("⏭️  Full snapshot skipped (--no-snapshot)")
+            return len(listings)
+        
         # Save as JSON
         json_filename = os.path.join(results_dir, f"{filename_prefix}_{timestamp}.json")
         try:
@@ -972,9 +3589,11 @@ Diagnostic Results:
                         'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
                         'total_listings': len(listings),
                         'search_terms': ['car cover', 'vehicle cover'],
-                        'scraper_version': '2.0_enhanced'
+                        'scraper_version': '2.0_enhanced',
+                        'stage_timings': self.stage_timings,
+                        'page_weights': self.page_weights
                     },
-                    'listings': listings
+                    'listings': [listing_to_dict(l) for l in listings]
                 }, f, indent=2, ensure_ascii=False)
             print(f"💾 Enhanced JSON saved: {json_filename}")
         except Exception as e:
@@ -983,7 +3602,8 @@ Diagnostic Results:
         # Save as CSV
         csv_filename = os.path.join(results_dir, f"{filename_prefix}_{timestamp}.csv")
         try:
-            df = pd.DataFrame(listings)
+            import pandas as pd
+            df = pd.DataFrame([listing_to_dict(l) for l in listings])
             df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
             print(f"💾 Enhanced CSV saved: {csv_filename}")
         except Exception as e:
@@ -1033,78 +3653,281 @@ Diagnostic Results:
             print(f"💾 Enhanced report saved: {txt_filename}")
         except Exception as e:
             print(f"Error saving report: {e}")
+        return len(listings)
     
+    def write_run_profile(self, filename_prefix="run_profile"):
+        """Write the run profile (spans, counters, cache and stage stats) next to the results"""
+        if not self.profiler:
+            return None
+        extra = {'argv': sys.argv[1:], 'stage_timings': self.stage_timings}
+        if self.response_cache:
+            extra['cache'] = dict(self.response_cache.stats)
+        if self.host_budget.counts:
+            extra['requests_per_host'] = dict(self.host_budget.counts)
+        if hasattr(self.session, 'connection_stats'):
+            extra['transport'] = self.session.connection_stats()
+        extra['api_flow'] = dict(self.api_flow.stats)
+        path = os.path.join(self.results_dir, f"{filename_prefix}_{int(time.time())}.json")
+        try:
+            profile = self.profiler.write(path, extra)
+        except Exception as e:
+            print(f"Error saving run profile: {e}")
+            return None
+        print(f"⏱️  Run profile saved: {path}")
+        for name, span in list(profile['spans'].items())[:8]:
+            print(f"   {name:<34}{span['seconds']:>9.3f}s {span['calls']:>7} calls "
+                  f"{span['items_in']:>8} in {span['items_out']:>8} out")
+        return path
+
+    def save_parquet(self, listings, file_prefix=None):
+        """Write listings to the Parquet dataset under parquet_dir"""
+        try:
+            with ParquetListingWriter(self.parquet_dir, file_prefix=file_prefix) as writer:
+                for listing in listings:
+                    writer.write(listing)
+            for path in writer.paths:
+                print(f"💾 Parquet saved: {path}")
+        except ImportError:
+            print("Error saving Parquet: pyarrow is not installed (pip install pyarrow)")
+        except Exception as e:
+            print(f"Error saving Parquet: {e}")
+
     def run_enhanced_scraper(self):
         """Main enhanced scraper execution"""
         print("🚀 Enhanced OLX Car Cover Scraper v2.0")
         print("=" * 60)
         
         # API-first attempt (can skip Selenium entirely if --api-only)
+        self.api_first_listings = []
         try:
             print("🔎 Trying API-first extraction...")
-            api_listings = self.fetch_via_relevance_api(query=self.api_query, size=self.api_size, location=self.api_location)
+            api_listings = self.fetch_configured_api_listings()
             if api_listings:
                 print(f"   ✅ API-first extracted {len(api_listings)} items")
                 unique_listings = self.remove_duplicates(api_listings)
                 enhanced_listings = self.enhance_listings(unique_listings)
-                self.save_results(enhanced_listings)
                 if self.api_only or len(unique_listings) >= 10:
+                    self.save_results(enhanced_listings)
                     print("   🛑 Skipping Selenium due to API success (api-only or sufficient results)")
                     return enhanced_listings
+                # Write the API results now, but leave the store/delta run to the final save
+                self.save_results(enhanced_listings, track_changes=False)
+                self.api_first_listings = enhanced_listings
         except Exception as e:
             print(f"   ⚠️ API-first step failed: {e}")
         
-        if not self.setup_driver():
-            print("❌ Failed to setup driver")
-            return []
+        if self.browser_workers > 1:
+            return self.scrape_search_urls_parallel()
         
+        with self.browser_session() as driver:
+            if driver is None:
+                print("❌ Failed to setup driver")
+                self.track_changes([])
+                return []
+            return self.scrape_search_urls()
+    
+    @contextmanager
+    def browser_session(self):
+        """Browser for one run: borrowed from the pool, or launched and always quit afterwards"""
+        if self.browser_pool is not None:
+            try:
+                driver = self.browser_pool.acquire()
+            except RuntimeError as e:
+                print(f"⚠️ Browser pool unavailable: {e}")
+                driver = None
+            self.attach_driver(driver)
+            try:
+                yield driver
+            finally:
+                self.attach_driver(None)
+                if driver is not None:
+                    self.browser_pool.release(driver)
+            return
+        driver = self.create_driver()
+        self.attach_driver(driver)
+        try:
+            yield driver
+        finally:
+            self.attach_driver(None)
+            if driver is not None:
+                try:
+                    driver.quit()
+                    print("\n🔒 Browser closed successfully")
+                except Exception as e:
+                    print(f"\n⚠️ Browser cleanup error: {e}")
+    
+    def scrape_search_urls(self):
+        """Selenium pass over the search URLs with the attached browser"""
         listings = []
         
         # Try multiple URLs
-        for i, search_url in enumerate(self.search_urls):
-            print(f"\n🌐 Attempt {i+1}/{len(self.search_urls)}")
+        targets = self.crawl_targets()
+        for n, (i, search_url) in enumerate(targets):
+            print(f"\n🌐 Attempt {n+1}/{len(targets)}")
             print(f"   URL: {search_url}")
             
             try:
-                self.current_url_index = i
-                self.driver.get(search_url)
-                
-                # Advanced protection bypass
-                if not self.advanced_protection_bypass():
-                    print(f"   ❌ Protection bypass failed for URL {i+1}")
+                url_listings = self.scrape_url(search_url, i)
+                if url_listings is None:
                     continue
                 
-                # Smart content waiting
-                if not self.smart_wait_for_content():
-                    print(f"   ⚠️ Content loading issues for URL {i+1}")
-                    # Continue anyway, might still get some data
-                
-                # Enhanced human simulation
-                self.enhanced_human_simulation()
-                
-                # Comprehensive extraction
-                url_listings = self.comprehensive_extraction()
-                
                 if url_listings and len(url_listings) > 0:
                     listings.extend(url_listings)
                     print(f"   ✅ Successfully extracted {len(url_listings)} listings from URL {i+1}")
                     
-                    # If we got good results, we can stop trying other URLs
-                    if len([l for l in url_listings if l.get('title') and l.get('price')]) >= 3:
+                    # If we got good results, we can stop trying other URLs (unless crawling result pages)
+                    if self.selenium_pages <= 1 and len([l for l in url_listings if l.get('title') and l.get('price')]) >= 3:
                         print("   🎯 Good results obtained, stopping URL attempts")
                         break
+                    if self.target_count and len(self.remove_duplicates(listings)) >= self.target_count:
+                        print(f"   🎯 Target of {self.target_count} listings reached, stopping URL attempts")
+                        break
                 else:
                     print(f"   ⚠️ No listings from URL {i+1}")
                 
                 # Small delay between attempts
-                if i < len(self.search_urls) - 1:
+                if n < len(targets) - 1 and not self.fast_mode:
                     print("   ⏳ Waiting before next attempt...")
-                    time.sleep(5)
+                    time.sleep(random.uniform(1, 3))
                     
             except Exception as e:
                 print(f"   ❌ Error with URL {i+1}: {e}")
                 continue
         
+        self.report_stage_timings()
+        self.report_page_weights()
+        return self.finish_browser_listings(listings)
+    
+    def scrape_url(self, search_url, index, use_api=True):
+        """Load one results page in the attached browser and extract its listings (None if blocked)"""
+        self.current_url_index = index
+        with self.timed_stage('load'):
+            self.driver.get(search_url)
+        
+        # Advanced protection bypass
+        with self.timed_stage('protection'):
+            bypassed = self.advanced_protection_bypass()
+        if not bypassed:
+            print(f"   ❌ Protection bypass failed for URL {index+1}")
+            return None
+        
+        # Smart content waiting
+        with self.timed_stage('content'):
+            content_ready = self.smart_wait_for_content()
+        if not content_ready:
+            print(f"   ⚠️ Content loading issues for URL {index+1}")
+            # Continue anyway, might still get some data
+        self.record_page_weight(search_url)
+        
+        # Enhanced human simulation
+        with self.timed_stage('simulation'):
+            self.enhanced_human_simulation()
+        
+        # Comprehensive extraction
+        with self.timed_stage('extraction'):
+            return self.comprehensive_extraction(use_api=use_api)
+    
+    def crawl_targets(self):
+        """(url_index, url) work items: every search URL, expanded to --pages result pages"""
+        targets = []
+        for i, search_url in enumerate(self.search_urls):
+            targets.append((i, search_url))
+            for page in range(2, max(1, self.selenium_pages) + 1):
+                separator = '&' if '?' in search_url else '?'
+                targets.append((i, f"{search_url}{separator}page={page}"))
+        return targets
+    
+    def spawn_worker(self):
+        """Scraper copy for one browser worker (shares session, caches and settings, not the driver)"""
+        worker = copy.copy(self)
+        worker.driver = None
+        worker.wait = None
+        worker.stage_timings = []
+        worker.page_weights = []
+        return worker
+    
+    def scrape_search_urls_parallel(self):
+        """Selenium pass with several browsers pulling URLs/pages from a shared queue"""
+        targets = self.crawl_targets()
+        workers = max(1, min(self.browser_workers, len(targets)))
+        print(f"🧵 Crawling {len(targets)} pages with {workers} browser workers")
+        
+        tasks = queue.Queue()
+        for target in targets:
+            tasks.put(target)
+        results = queue.Queue()
+        stop = threading.Event()
+        
+        own_pool = self.browser_pool is None
+        pool = BrowserPool(self.create_driver, size=workers) if own_pool else self.browser_pool
+        if own_pool:
+            pool.start()
+        
+        def work():
+            worker = self.spawn_worker()
+            try:
+                try:
+                    driver = pool.acquire()
+                except RuntimeError as e:
+                    print(f"   ⚠️ Browser worker unavailable: {e}")
+                    return
+                worker.attach_driver(driver)
+                try:
+                    while not stop.is_set():
+                        try:
+                            index, url = tasks.get_nowait()
+                        except queue.Empty:
+                            break
+                        print(f"\n🌐 [{threading.current_thread().name}] URL: {url}")
+                        try:
+                            url_listings = worker.scrape_url(url, index, use_api=False)
+                        except Exception as e:
+                            print(f"   ❌ Error with {url}: {e}")
+                            url_listings = None
+                        results.put((index, url, url_listings or []))
+                finally:
+                    worker.attach_driver(None)
+                    pool.release(driver)
+            finally:
+                results.put(('done', worker.stage_timings, worker.page_weights))
+        
+        threads = [threading.Thread(target=work, name=f"browser-{n+1}", daemon=True) for n in range(workers)]
+        for thread in threads:
+            thread.start()
+        
+        listings, dedup = [], self.new_dedup_index()
+        finished, first_hit = 0, None
+        try:
+            while finished < len(threads):
+                index, url, url_listings = results.get()
+                if index == 'done':
+                    self.stage_timings.extend(url)
+                    self.page_weights.extend(url_listings)
+                    finished += 1
+                    continue
+                fresh = [l for l in url_listings if self.is_new_listing(l, dedup)]
+                listings.extend(fresh)
+                if fresh and (first_hit is None or index < first_hit):
+                    first_hit = index
+                print(f"   ✅ {url}: {len(url_listings)} listings ({len(fresh)} new, {len(listings)} total)")
+                if self.target_count and len(listings) >= self.target_count and not stop.is_set():
+                    print(f"   🎯 Target of {self.target_count} listings reached, stopping workers")
+                    stop.set()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            if own_pool:
+                pool.close()
+        
+        if first_hit is not None:
+            self.current_url_index = first_hit
+        self.report_stage_timings()
+        self.report_page_weights()
+        return self.finish_browser_listings(listings)
+    
+    def finish_browser_listings(self, listings):
+        """Dedup, enhance and save browser-extracted listings, with requests/diagnostic fallbacks"""
         # Post-process results
         if listings:
             unique_listings = self.remove_duplicates(listings)
@@ -1132,87 +3955,240 @@ Diagnostic Results:
             diagnostic_listings = self.create_diagnostic_info()
             self.save_results(diagnostic_listings)
             return diagnostic_listings
-        
-        # Cleanup
-        if self.driver:
-            try:
-                self.driver.quit()
-                print("\n🔒 Browser closed successfully")
-            except Exception as e:
-                print(f"\n⚠️ Browser cleanup error: {e}")
-        
-            finally:
-                if self.driver:
-                    try:
-                        self.driver.quit()
-                        print("\n🔒 Browser closed in finally block")
-                    except Exception as e:
-                        print(f"\n⚠️ Final cleanup error: {e}")
     
-    def enhance_listings(self, listings):
-        """Enhance listings with additional processing"""
-        enhanced = []
+    # Quality score = sum of these weights for the fields a listing has
+    QUALITY_WEIGHTS = [('title', 3), ('price', 3), ('location', 2), ('url', 1), ('image_url', 1)]
+    # Below this many listings scores and ranking stay in pure Python, so typical --api-only runs
+    # never import numpy; above it the column-wise numpy path is faster than the import costs
+    NUMPY_MIN_LISTINGS = 5000
+
+    @profiled()
+    def enhance_listings(self, listings, top=None):
+        """Enhance listings with additional processing (scores and sort keys computed column-wise)"""
+        enhanced = [self.clean_listing(listing) for listing in listings]
+        count = len(enhanced)
+        if not count:
+            return enhanced
         
-        for listing in listings:
-            # Clean and enhance title
-            if listing.get('title'):
-                title = listing['title'].strip()
-                # Remove extra whitespace and normalize
-                title = re.sub(r'\s+', ' ', title)
-                listing['title'] = title
-            
-            # Standardize price format
-            if listing.get('price'):
-                price = listing['price']
-                # Extract numeric value if possible
-                price_match = re.search(r'[\d,]+', price.replace(' ', ''))
-                if price_match:
-                    numeric_price = price_match.group().replace(',', '')
-                    if numeric_price.isdigit():
-                        listing['price_numeric'] = int(numeric_price)
-                        listing['price_formatted'] = f"₹{int(numeric_price):,}"
-            
-            # Add quality score based on available information
-            quality_score = 0
-            if listing.get('title'): quality_score += 3
-            if listing.get('price'): quality_score += 3
-            if listing.get('location'): quality_score += 2
-            if listing.get('url'): quality_score += 1
-            if listing.get('image_url'): quality_score += 1
-            
-            listing['quality_score'] = quality_score
-            
-            enhanced.append(listing)
+        # Add quality score based on available information
+        if count < self.NUMPY_MIN_LISTINGS:
+            scores = [sum(weight for field, weight in self.QUALITY_WEIGHTS if l.get(field)) for l in enhanced]
+        else:
+            import numpy as np
+
+            scores = np.zeros(count, dtype=np.int64)
+            for field, weight in self.QUALITY_WEIGHTS:
+                scores += weight * np.fromiter((bool(l.get(field)) for l in enhanced), dtype=np.int64, count=count)
+        for listing, score in zip(enhanced, list(scores)):
+            listing['quality_score'] = int(score)
         
-        # Sorting behavior
+        # --top is applied in save_results (after the store/delta saw every listing); an explicit
+        # top here ranks only the best N with a partial selection
+        order = self.rank_listings(enhanced, scores, top)
+        return [enhanced[i] for i in order]
+    
+    def listing_sort_key(self, listing, score):
+        """Pure-Python sort key for one listing, equal to its listing_sort_keys entry"""
         sort_by = getattr(self, 'sort_by', 'quality') or 'quality'
-        featured_first = getattr(self, 'featured_first', False)
-
-        def sort_key(x):
-            key_parts = []
-            if featured_first:
-                key_parts.append(0 if x.get('featured') else 1)
-            if sort_by == 'date':
-                # Newest first
-                ts = x.get('posted_at_ts') or 0
-                key_parts.append(-int(ts))
-            elif sort_by == 'price':
-                # Highest price first
-                key_parts.append(-(x.get('price_numeric') or 0))
-            else:
-                # Default to quality/relevance
-                key_parts.append(-(x.get('quality_score', 0)))
-            return tuple(key_parts)
+        if sort_by == 'date':
+            primary = -int(listing.get('posted_at_ts') or 0)
+        elif sort_by == 'price':
+            primary = -int(listing.get('price_numeric') or 0)
+        else:
+            primary = -score
+        key = min(max(primary, -(1 << 61)), (1 << 61) - 1)
+        if getattr(self, 'featured_first', False) and not listing.get('featured'):
+            key += 1 << 62
+        return key
+
+    def listing_sort_keys(self, listings, scores):
+        """One int64 sort key per listing, equivalent to the (featured, date/price/quality) tuple key"""
+        import numpy as np
+
+        count = len(listings)
+        sort_by = getattr(self, 'sort_by', 'quality') or 'quality'
+        if sort_by == 'date':
+            # Newest first
+            primary = -np.fromiter((int(l.get('posted_at_ts') or 0) for l in listings), dtype=np.int64, count=count)
+        elif sort_by == 'price':
+            # Highest price first
+            primary = -np.fromiter((int(l.get('price_numeric') or 0) for l in listings), dtype=np.int64, count=count)
+        else:
+            # Default to quality/relevance
+            primary = -scores
+        keys = np.clip(primary, -(1 << 61), (1 << 61) - 1)
+        if getattr(self, 'featured_first', False):
+            not_featured = np.fromiter((not l.get('featured') for l in listings), dtype=np.int64, count=count)
+            keys = keys + (not_featured << 62)
+        return keys
+    
+    def rank_listings(self, listings, scores, top=None):
+        """Indices in sort order (stable); with top, partial selection instead of a full sort"""
+        if len(listings) < self.NUMPY_MIN_LISTINGS:
+            keys = [self.listing_sort_key(listing, score) for listing, score in zip(listings, scores)]
+            if top is None or top >= len(keys):
+                return sorted(range(len(keys)), key=keys.__getitem__)
+            # heapq.nsmallest is stable, like the full sort
+            return heapq.nsmallest(max(top, 0), range(len(keys)), key=keys.__getitem__)
+
+        import numpy as np
 
-        enhanced.sort(key=sort_key)
+        keys = self.listing_sort_keys(listings, np.asarray(scores, dtype=np.int64))
+        if top is None or top >= len(keys):
+            return np.argsort(keys, kind='stable').tolist()
+        if top <= 0:
+            return []
+        # Everything up to the top-th smallest key; ties keep input order, like the full stable sort
+        kth = np.partition(keys, top - 1)[top - 1]
+        candidates = np.flatnonzero(keys <= kth)
+        return candidates[np.argsort(keys[candidates], kind='stable')[:top]].tolist()
+    
+    def clean_listing(self, listing):
+        """Normalize title whitespace and fill price_numeric/price_formatted when not already parsed"""
+        # Clean and enhance title
+        title = listing.get('title')
+        if title:
+            # Remove extra whitespace and normalize (same result as re.sub(r'\s+', ' ', title.strip());
+            # benchmarks.py enhance checks this on its corpus)
+            listing['title'] = ' '.join(title.split())
         
-        return enhanced
+        # Standardize price format (API and browser records usually carry price_numeric already)
+        price = listing.get('price')
+        if price and not listing.get('price_numeric'):
+            # Extract numeric value if possible
+            price_match = re.search(r'[\d,]+', price.replace(' ', ''))
+            if price_match:
+                numeric_price = price_match.group().replace(',', '')
+                if numeric_price.isdigit():
+                    listing['price_numeric'] = int(numeric_price)
+        if listing.get('price_numeric') and not listing.get('price_formatted'):
+            listing['price_formatted'] = f"₹{int(listing['price_numeric']):,}"
+        return listing
     
+    def enhance_listing(self, listing):
+        """Clean title/price fields and add a quality score to one listing (no sorting)"""
+        self.clean_listing(listing)
+        listing['quality_score'] = sum(weight for field, weight in self.QUALITY_WEIGHTS if listing.get(field))
+        return listing
+    
+    def iter_configured_api_listings(self):
+        """Yield configured API listings, page by page when pagination is enabled"""
+        if self.api_paginate and not (self.fanout_queries or self.fanout_locations):
+            yield from self.iter_relevance_api_pages(
+                query=self.api_query, size=self.api_size, location=self.api_location,
+                max_pages=self.api_max_pages, concurrency=self.api_concurrency
+            )
+        else:
+            yield from self.fetch_configured_api_listings()
+
+    @profiled(count_out=lambda count: count or 0)
+    def stream_api_results(self, filename_prefix="olx_car_covers_enhanced"):
+        """Dedup, enhance and write API listings one at a time; memory stays flat (output is unsorted)"""
+        os.makedirs(self.results_dir, exist_ok=True)
+        base_path = os.path.join(self.results_dir, f"{filename_prefix}_{int(time.time())}")
+        dedup = self.new_dedup_index()
+        store_run = self.listing_store.begin_run(self.api_scope()) if self.listing_store else None
+        delta_run = self.delta_index.begin_run(self.api_scope()) if self.delta_index is not None else None
+        parquet = None
+        if self.parquet_dir:
+            try:
+                parquet = ParquetListingWriter(self.parquet_dir, file_prefix=os.path.basename(base_path))
+            except ImportError:
+                print("⚠️ Parquet output skipped: pyarrow is not installed (pip install pyarrow)")
+        with StreamingListingWriter(base_path, compression=self.stream_compression) as writer:
+            try:
+                for listing in self.iter_configured_api_listings():
+                    if not self.is_new_listing(listing, dedup):
+                        continue
+                    listing = self.enhance_listing(listing)
+                    writer.write(listing)
+                    if parquet:
+                        parquet.write(listing)
+                    if store_run is not None:
+                        self.listing_store.upsert(store_run, listing)
+                    if delta_run is not None:
+                        self.delta_index.observe(delta_run, listing)
+            finally:
+                if parquet:
+                    parquet.close()
+        print(f"💾 Streamed {writer.count} listings: {writer.jsonl_path}")
+        if writer.csv_path:
+            print(f"💾 Streamed CSV: {writer.csv_path}")
+        if parquet:
+            for path in parquet.paths:
+                print(f"💾 Streamed Parquet: {path}")
+        if store_run is not None and writer.count:
+            counts = self.listing_store.finish_run(store_run, complete=self.api_crawl_complete is not False)
+            print(f"🗃️  Store: {counts['new']} new, {counts['changed']} changed, "
+                  f"{counts['removed']} removed, {counts['unchanged']} unchanged ({self.listing_store.path})")
+        if delta_run is not None and writer.count:
+            self.write_delta(self.delta_index.finish_run(delta_run, complete=self.api_crawl_complete is not False),
+                             f"{base_path}_delta.json")
+        return writer.count
+
+    @property
+    def html_engine(self):
+        """Shared HTMLExtractionEngine for the configured backend (created on first use)"""
+        if self._html_engine is None:
+            self._html_engine = HTMLExtractionEngine(self.html_backend)
+        return self._html_engine
+
+    def listing_from_card(self, card, index, source='html_engine'):
+        """Build a Listing from extracted listing-card fields"""
+        url = card.get('href') or ''
+        if url and not url.startswith('http'):
+            url = urljoin(self.base_url, url)
+        iid = re.search(r'-iid-(\d+)', url)
+        image_url = card.get('image_url') or ''
+        price = card.get('price') or ''
+        listing = Listing(
+            id=iid.group(1) if iid else f"{source}_{index}",
+            title=(card.get('title') or card.get('alt') or '')[:200],
+            price=price[:50],
+            location=card.get('location') or '',
+            url=url,
+            image_url=image_url if image_url.startswith('http') else '',
+            description=card.get('details') or '',
+            scraped_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+            source=source
+        )
+        price_num, price_fmt = self.parse_price_fields(price)
+        if price_num:
+            listing['price_numeric'] = price_num
+        if price_fmt:
+            listing['price_formatted'] = price_fmt
+        return listing
+
+    @profiled()
+    def extract_listings_from_html(self, html_content, source='html_engine'):
+        """Extract listings from raw results-page HTML or a PageSnapshot (filtered unless --no-filter)"""
+        try:
+            if isinstance(html_content, PageSnapshot):
+                cards = html_content.cards(self.html_engine)
+            else:
+                cards = self.html_engine.extract(html_content)
+        except Exception as e:
+            print(f"   ⚠️ HTML engine error: {e}")
+            return []
+        listings = []
+        for i, card in enumerate(cards, 1):
+            listing = self.listing_from_card(card, i, source)
+            if not listing.get('title'):
+                continue
+            if self.no_filter or self.filter_to_car_cover(listing):
+                listings.append(listing)
+        return listings
+
+    @profiled()
     def parse_html_content(self, html_content, url):
         """Parse HTML content from requests fallback"""
         try:
+            listings = self.extract_listings_from_html(html_content, source='requests_fallback')
+            if listings:
+                return listings
+            
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(html_content, 'html.parser')
-            listings = []
             
             # Look for car cover mentions
             text_content = soup.get_text()
@@ -1237,16 +4213,16 @@ Diagnostic Results:
                 
                 # If no specific elements found, create summary
                 if not listings and (car_cover_count > 0 or price_count > 0):
-                    listing = {
-                        'id': 'requests_summary',
-                        'title': 'Car Cover Listings (Requests Method)',
-                        'price': f'{price_count} prices found',
-                        'location': 'Various',
-                        'url': url,
-                        'description': f'Found {car_cover_count} car cover mentions and {price_count} prices',
-                        'scraped_at': time.strftime("%Y-%m-%d %H:%M:%S"),
-                        'source': 'requests_summary'
-                    }
+                    listing = Listing(
+                        id='requests_summary',
+                        title='Car Cover Listings (Requests Method)',
+                        price=f'{price_count} prices found',
+                        location='Various',
+                        url=url,
+                        description=f'Found {car_cover_count} car cover mentions and {price_count} prices',
+                        scraped_at=time.strftime("%Y-%m-%d %H:%M:%S"),
+                        source='requests_summary'
+                    )
                     listings.append(listing)
             
             return listings
@@ -1271,10 +4247,125 @@ def main():
     parser.add_argument("--no-filter", action="store_true", help="Bypass car-cover filtering to mirror UI result set")
     parser.add_argument("--sort", type=str, choices=['quality','date','price','relevance'], default=None, help="Sort output: quality (default), date, price, relevance")
     parser.add_argument("--featured-first", action="store_true", help="Place featured/promoted items first (best-effort)")
+    parser.add_argument("--paginate", action="store_true", help="Walk all relevance API pages instead of a single request")
+    parser.add_argument("--max-pages", type=int, default=None, help="Maximum API pages to fetch with --paginate (default: 50)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Concurrent API page workers with --paginate (default: 4)")
+    parser.add_argument("--queries", type=str, default=None, help="Comma-separated API queries to fan out over (e.g. 'car cover,body cover')")
+    parser.add_argument("--locations", type=str, default=None, help="Comma-separated OLX location IDs to fan out over")
+    parser.add_argument("--facet-limit", type=int, default=None, help="facet_limit sent with API requests (default: 1000, as the site does; facets are not used, so e.g. 10 makes responses much smaller)")
+    parser.add_argument("--json-parser", type=str, choices=['auto', 'stream', 'whole', 'json'], default='auto', help="API response parser: stream (ijson, skips facets), whole (orjson if installed), json (stdlib); auto streams large responses (default: auto)")
+    parser.add_argument("--rate", type=float, default=None, help="API request rate limit in requests/second, shared by every worker (token bucket)")
+    parser.add_argument("--burst", type=int, default=None, help="Requests allowed back to back under --rate (default: max(1, rate))")
+    parser.add_argument("--api-retries", type=int, default=3, help="Retries for API requests failing with 429/5xx or a network error (default: 3)")
+    parser.add_argument("--cache", type=str, choices=['dir', 'sqlite'], default=None, help="Cache relevance API responses on disk (directory or SQLite backend)")
+    parser.add_argument("--cache-path", type=str, default=None, help="Cache location (default: .olx_api_cache or .olx_api_cache.sqlite)")
+    parser.add_argument("--cache-ttl", type=int, default=300, help="Seconds a cached response stays fresh before revalidation (default: 300)")
+    parser.add_argument("--cache-max-entries", type=int, default=500, help="Maximum cached responses before LRU eviction (default: 500)")
+    parser.add_argument("--store", type=str, default=None, help="Upsert API listings into this SQLite store and report new/changed/removed")
+    parser.add_argument("--history", type=str, default=None, help="Print the stored change history of a listing ID (needs --store) and exit")
+    parser.add_argument("--stream-output", action="store_true", help="API-only: write JSON Lines + CSV record by record (flat memory, unsorted)")
+    parser.add_argument("--compress", type=str, choices=['gzip', 'zstd'], default=None, help="Compress streamed output files")
+    parser.add_argument("--parquet", type=str, nargs='?', const=os.path.join("olx_scraping_results", "parquet"), default=None, help="Also write a typed Parquet dataset partitioned by scrape date (default dir: olx_scraping_results/parquet)")
+    parser.add_argument("--extract-html", type=str, nargs='+', default=None, metavar="FILE", help="Offline: extract listings from saved results-page HTML files and exit (no browser, no network)")
+    parser.add_argument("--html-backend", type=str, choices=['auto', 'lxml', 'selectolax', 'bs4'], default='auto', help="HTML parser for listing-card extraction (default: auto = fastest installed)")
+    parser.add_argument("--no-bulk-dom", action="store_true", help="Selenium: parse listing cards element by element instead of one in-page script call")
+    parser.add_argument("--fast", action="store_true", help="Selenium: skip scroll simulation when listings are already rendered and the delay between URLs")
+    parser.add_argument("--stage-budget", type=str, nargs='+', default=None, metavar="STAGE=SECONDS", help="Selenium latency budget per stage (load, protection, content, simulation)")
+    parser.add_argument("--browser-pool", type=int, default=None, metavar="N", help="Keep up to N browser sessions (launched on first use) and reuse them across runs (reset between uses)")
+    parser.add_argument("--browser-workers", type=int, default=1, metavar="N", help="Selenium: crawl search URLs/pages with N browsers in parallel (default: 1, sequential)")
+    parser.add_argument("--pages", type=int, default=1, help="Selenium: result pages to crawl per search URL (default: 1)")
+    parser.add_argument("--target-count", type=int, default=None, help="Selenium: stop crawling once this many unique listings are collected")
+    parser.add_argument("--block-resources", type=str, nargs='*', choices=sorted(BLOCKED_RESOURCE_PATTERNS), default=None, help="Selenium: stop these resource types loading (no value = all: analytics, fonts, images, media)")
+    parser.add_argument("--block-pattern", type=str, nargs='+', default=None, metavar="PATTERN", help="Selenium: extra URL patterns to block (wildcards, e.g. '*ads.example.com*')")
+    parser.add_argument("--near-dup", action="store_true", help="Also drop near-duplicate reposts (MinHash over title + description; needs numpy)")
+    parser.add_argument("--near-dup-threshold", type=float, default=0.8, help="Similarity at which --near-dup treats two listings as the same ad (default: 0.8)")
+    parser.add_argument("--delta", type=str, nargs='?', const=os.path.join("olx_scraping_results", "delta_index.json"), default=None, metavar="INDEX", help="Also write a _delta.json of new, price-changed, updated and removed API listings since the previous run (index default: olx_scraping_results/delta_index.json)")
+    parser.add_argument("--no-snapshot", action="store_true", help="Skip the full JSON/CSV/report snapshot (use with --delta)")
+    parser.add_argument("--top", type=int, default=None, metavar="N", help="Write only the best N listings in the chosen sort order (store and delta still see all)")
+    parser.add_argument("--host-budget", type=int, default=None, help="Maximum requests per host for this run (default: unlimited)")
+    parser.add_argument("--pool-size", type=int, default=None, help="Keep-alive connections per host in the HTTP pool (default: 20, at least --concurrency)")
+    parser.add_argument("--http2", action="store_true", help="Use an HTTP/2 client (httpx) for API and fallback requests; needs pip install httpx[http2]")
+    parser.add_argument("--daemon", type=str, default=None, metavar="JOBS_FILE", help="Keep running and scrape the jobs in this JSON file on their intervals (headless, no prompts)")
+    parser.add_argument("--daemon-workers", type=int, default=1, help="Jobs that may run at the same time in --daemon mode (default: 1)")
+    parser.add_argument("--profile", action="store_true", help="Write a JSON run profile (per-stage seconds, items in/out, bytes, cache hits) to the results directory")
+    parser.add_argument("--cprofile", type=str, default=None, metavar="FILE", help="Run under cProfile, save stats to FILE and print the top functions")
     args, unknown = parser.parse_known_args()
 
+    if getattr(args, 'cprofile', None):
+        run_with_cprofile(run_cli, args, args.cprofile)
+    else:
+        run_cli(args)
+
+
+def run_with_cprofile(func, args, path):
+    """Run func(args) under cProfile, save the stats and print the top functions by cumulative time"""
+    import cProfile
+    import pstats
+
+    profile = cProfile.Profile()
+    try:
+        profile.runcall(func, args)
+    finally:
+        profile.dump_stats(path)
+        print(f"\n🔬 cProfile stats saved: {path} (browse with: python -m pstats {path})")
+        pstats.Stats(profile).sort_stats('cumulative').print_stats(15)
+
+
+def run_cli(args):
+    """Run the scraper for parsed CLI arguments"""
+
+    if getattr(args, 'host_budget', None) is not None and args.host_budget < 1:
+        print(f"❌ --host-budget must be at least 1 (got {args.host_budget}); omit it for no limit")
+        return
+
+    # History lookups only read the store: no scraping, no prompts
+    if getattr(args, 'history', None):
+        if not args.store:
+            print("❌ --history needs --store <path>")
+            return
+        store = ListingStore(args.store)
+        entries = store.history(args.history)
+        print(f"📜 History for listing {args.history}: {len(entries)} entries")
+        for entry in entries:
+            observed = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry['observed_at']))
+            price = f"₹{entry['price_numeric']:,}" if entry.get('price_numeric') is not None else '-'
+            print(f"   {observed}  {entry['change']:<8} {price}")
+        store.close()
+        return
+
+    # Offline re-extraction of archived pages: no browser, no prompts
+    if getattr(args, 'extract_html', None):
+        scraper = ImprovedOLXScraper(headless=True)
+        scraper.html_backend = args.html_backend
+        scraper.near_duplicates = bool(args.near_dup)
+        scraper.near_dup_threshold = args.near_dup_threshold
+        scraper.no_filter = bool(args.no_filter)
+        if args.sort:
+            scraper.sort_by = args.sort
+        scraper.featured_first = bool(args.featured_first)
+        scraper.top_n = args.top
+        scraper.profiler = RunProfiler() if args.profile else None
+        listings = []
+        for path in args.extract_html:
+            try:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    page = f.read()
+            except OSError as e:
+                print(f"❌ Cannot read {path}: {e}")
+                continue
+            start = time.time()
+            page_listings = scraper.extract_listings_from_html(page, source='html_offline')
+            print(f"📄 {path}: {len(page_listings)} listings in {time.time() - start:.3f}s "
+                  f"({scraper.html_engine.backend.name})")
+            listings.extend(page_listings)
+        enhanced = scraper.enhance_listings(scraper.remove_duplicates(listings))
+        scraper.save_results(enhanced, filename_prefix="olx_car_covers_offline")
+        print(f"\n✅ Offline extraction: {len(enhanced)} listings saved")
+        scraper.write_run_profile()
+        return
+
     # User preferences (only prompt if flag not provided)
-    if args.headless:
+    if args.headless or getattr(args, 'daemon', None):
         headless = True
     else:
         print("Configuration Options:")
@@ -1286,6 +4377,8 @@ def main():
     
     # Create and run enhanced scraper
     scraper = ImprovedOLXScraper(headless=headless)
+    if getattr(args, 'profile', False):
+        scraper.profiler = RunProfiler()
     # Apply CLI overrides for API
     if getattr(args, 'query', None):
         scraper.api_query = args.query
@@ -1301,24 +4394,125 @@ def main():
             pass
     if getattr(args, 'api_only', False):
         scraper.api_only = True
+    if getattr(args, 'facet_limit', None) is not None:
+        scraper.api_facet_limit = max(0, int(args.facet_limit))
+    scraper.json_parser = getattr(args, 'json_parser', 'auto')
     if getattr(args, 'no_filter', False):
         scraper.no_filter = True
     if getattr(args, 'sort', None):
         scraper.sort_by = args.sort
     if getattr(args, 'featured_first', False):
         scraper.featured_first = True
+    if getattr(args, 'top', None):
+        scraper.top_n = max(1, int(args.top))
+    if getattr(args, 'paginate', False):
+        scraper.api_paginate = True
+    if getattr(args, 'max_pages', None):
+        scraper.api_max_pages = max(1, int(args.max_pages))
+    if getattr(args, 'concurrency', None):
+        scraper.api_concurrency = max(1, int(args.concurrency))
+    if getattr(args, 'queries', None):
+        scraper.fanout_queries = [q.strip() for q in args.queries.split(',') if q.strip()]
+    if getattr(args, 'locations', None):
+        try:
+            scraper.fanout_locations = [int(loc) for loc in args.locations.split(',') if loc.strip()]
+        except ValueError:
+            print("⚠️ Ignoring --locations: expected comma-separated numeric IDs")
+    scraper.api_flow = APIFlowControl(
+        rate=max(0.01, float(args.rate)) if getattr(args, 'rate', None) else None,
+        burst=getattr(args, 'burst', None),
+        max_concurrency=scraper.api_concurrency,
+        retries=max(0, int(getattr(args, 'api_retries', 3))),
+    )
+    if getattr(args, 'cache', None):
+        try:
+            scraper.response_cache = create_response_cache(
+                args.cache, path=args.cache_path, ttl=max(0, args.cache_ttl),
+                max_entries=max(1, args.cache_max_entries)
+            )
+        except Exception as e:
+            print(f"⚠️ Response cache disabled: {e}")
+    if getattr(args, 'store', None):
+        try:
+            scraper.listing_store = ListingStore(args.store)
+        except Exception as e:
+            print(f"⚠️ Listing store disabled: {e}")
+    if getattr(args, 'stream_output', False):
+        scraper.stream_output = True
+        scraper.stream_compression = args.compress
+    if getattr(args, 'parquet', None):
+        scraper.parquet_dir = args.parquet
+    if getattr(args, 'delta', None):
+        scraper.delta_index = DeltaIndex(args.delta)
+    scraper.write_snapshot = not getattr(args, 'no_snapshot', False)
+    scraper.html_backend = args.html_backend
+    scraper.near_duplicates = bool(getattr(args, 'near_dup', False))
+    scraper.near_dup_threshold = getattr(args, 'near_dup_threshold', 0.8)
+    scraper.bulk_dom = not getattr(args, 'no_bulk_dom', False)
+    scraper.fast_mode = bool(getattr(args, 'fast', False))
+    scraper.browser_workers = max(1, int(getattr(args, 'browser_workers', 1) or 1))
+    scraper.selenium_pages = max(1, int(getattr(args, 'pages', 1) or 1))
+    scraper.target_count = getattr(args, 'target_count', None)
+    if getattr(args, 'block_resources', None) is not None:
+        scraper.blocked_resources = list(args.block_resources or sorted(BLOCKED_RESOURCE_PATTERNS))
+    scraper.blocked_url_patterns = list(getattr(args, 'block_pattern', None) or [])
+    for item in getattr(args, 'stage_budget', None) or []:
+        stage, _, seconds = item.partition('=')
+        try:
+            if stage not in scraper.stage_budgets:
+                raise ValueError(f"unknown stage '{stage}'")
+            scraper.stage_budgets[stage] = max(0.0, float(seconds))
+        except ValueError as e:
+            print(f"⚠️ Ignoring --stage-budget {item}: {e}")
+    if getattr(args, 'host_budget', None) is not None:
+        scraper.host_budget = HostRequestBudget(max_requests=args.host_budget)
+    scraper.configure_transport(pool_size=getattr(args, 'pool_size', None), http2=getattr(args, 'http2', False))
+    
+    # Daemon mode: one warm scraper runs the scheduled jobs until SIGTERM/Ctrl+C
+    if getattr(args, 'daemon', None):
+        try:
+            jobs = load_daemon_jobs(args.daemon)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"❌ Cannot load daemon jobs from {args.daemon}: {e}")
+            return
+        daemon = ScrapeDaemon(scraper, jobs, workers=args.daemon_workers)
+        if getattr(args, 'browser_pool', None) and any(job.browser for job in jobs):
+            with BrowserPool(scraper.create_driver, size=args.browser_pool) as pool:
+                scraper.browser_pool = pool
+                daemon.run()
+                print(f"🧰 Browser pool: {pool.summary()}")
+            scraper.browser_pool = None
+        else:
+            daemon.run()
+        if scraper.response_cache:
+            print(f"🗄️  API cache: {scraper.response_cache.summary()}")
+        print(f"🔌 Connections: {scraper.session.summary()}")
+        print(f"🚦 API flow: {scraper.api_flow.summary()}")
+        if scraper.listing_store:
+            scraper.listing_store.close()
+        scraper.write_run_profile()
+        return
     
     # Strict API-only fast path: fetch, save, and exit without touching Selenium
     if scraper.api_only:
         print("\n🧪 API-only mode: skipping Selenium entirely")
         try:
-            api_items = scraper.fetch_via_relevance_api(query=scraper.api_query, size=scraper.api_size, location=scraper.api_location)
-            api_items = scraper.remove_duplicates(api_items or [])
-            enhanced = scraper.enhance_listings(api_items)
-            scraper.save_results(enhanced)
-            print(f"\n✅ API-only SUCCESS: {len(enhanced)} listings saved")
+            if scraper.stream_output:
+                count = scraper.stream_api_results()
+                print(f"\n✅ API-only SUCCESS: {count} listings streamed")
+            else:
+                api_items = scraper.fetch_configured_api_listings()
+                api_items = scraper.remove_duplicates(api_items or [])
+                enhanced = scraper.enhance_listings(api_items)
+                scraper.save_results(enhanced)
+                print(f"\n✅ API-only SUCCESS: {len(enhanced)} listings saved")
+            if scraper.response_cache:
+                print(f"🗄️  API cache: {scraper.response_cache.summary()}")
+            print(f"🔌 Connections: {scraper.session.summary()}")
+            print(f"🚦 API flow: {scraper.api_flow.summary()}")
         except Exception as e:
             print(f"❌ API-only failure: {e}")
+        scraper.write_run_profile()
         print("\n🎉 Scraping process completed!")
         if not args.no_pause:
             try:
@@ -1334,7 +4528,14 @@ def main():
     print(f"   Filters: {'OFF (UI-parity)' if scraper.no_filter else 'ON (car-cover only)'} | Sort: {scraper.sort_by} | Featured-first: {scraper.featured_first}")
     
     start_time = time.time()
-    listings = scraper.run_enhanced_scraper()
+    if getattr(args, 'browser_pool', None):
+        with BrowserPool(scraper.create_driver, size=args.browser_pool) as pool:
+            scraper.browser_pool = pool
+            listings = scraper.run_enhanced_scraper()
+            print(f"🧰 Browser pool: {pool.summary()}")
+        scraper.browser_pool = None
+    else:
+        listings = scraper.run_enhanced_scraper()
     end_time = time.time()
     
     # Display comprehensive results
@@ -1342,6 +4543,11 @@ def main():
     print("📊 SCRAPING RESULTS SUMMARY")
     print("=" * 70)
     
+    if scraper.response_cache:
+        print(f"🗄️  API cache: {scraper.response_cache.summary()}")
+    print(f"🔌 Connections: {scraper.session.summary()}")
+    print(f"🚦 API flow: {scraper.api_flow.summary()}")
+
     if listings:
         print(f"✅ SUCCESS! Extracted {len(listings)} listings")
         print(f"⏱️  Total time: {end_time - start_time:.2f} seconds")
@@ -1386,6 +4592,7 @@ def main():
         print(f"   • Check internet connection stability")
         print(f"   • Try running in non-headless mode for debugging")
     
+    scraper.write_run_profile()
     print(f"\n🎉 Scraping process completed!")
     if not args.no_pause:
         try: